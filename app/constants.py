@@ -27,6 +27,24 @@ PRAYER_NAME_MAP = {
 
 PRAYER_NAMES = list(PRAYER_NAME_MAP.keys())
 
+# Optional notification-only alerts: UI names to API keys
+ALERT_NAME_MAP = {
+    "Imsak": "Imsak",
+    "Terbit": "Sunrise",
+}
+
+# Columns of a Ramadan imsakiyah: UI names to calculator keys, in day order
+IMSAKIYAH_NAME_MAP = {
+    "Imsak": "Imsak",
+    "Subuh": "Fajr",
+    "Terbit": "Sunrise",
+    "Dhuha": "Dhuha",
+    "Dzuhur": "Dhuhr",
+    "Ashar": "Asr",
+    "Maghrib": "Maghrib",
+    "Isya": "Isha",
+}
+
 # City coordinates mapping: city name → (latitude, longitude)
 # Used for accurate prayer time lookups via Aladhan coordinates API.
 CITY_COORDINATES: dict[str, tuple[float, float]] = {
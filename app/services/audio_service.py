@@ -1,33 +1,49 @@
 """Service for playing adhan audio files."""
 
 import os
+from collections import OrderedDict
 
 from PyQt6.QtCore import QUrl, QObject, pyqtSignal
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 
 
 class AudioService(QObject):
-    """Wraps QMediaPlayer to handle adhan audio playback."""
+    """Plays adhan audio from a small pool of preloaded QMediaPlayers.
+
+    Each distinct audio file gets its own player with its source already
+    set, so switching between e.g. the Subuh adhan and a short tone costs
+    nothing when a prayer fires. The pool holds at most ``POOL_SIZE``
+    players; ``retain()`` keeps the ones needed soon and evicts the rest.
+    """
 
     playback_finished = pyqtSignal()
 
+    # Default adhan plus the next two prayers' files
+    POOL_SIZE = 3
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._player = QMediaPlayer()
-        self._audio_output = QAudioOutput()
-        self._player.setAudioOutput(self._audio_output)
-        self._player.playbackStateChanged.connect(self._on_state_changed)
+        # file path → (player, output, volume factor of the loaded source),
+        # least recently used first
+        self._pool: OrderedDict[str, tuple[QMediaPlayer, QAudioOutput, float]] = OrderedDict()
+        self._current: QMediaPlayer | None = None
         self._volume: float = 1.0
         self._muted: bool = False
+        # source path → (decoded buffer path, loudness volume factor)
+        self._normalized: dict[str, tuple[str, float]] = {}
+        self._volume_factor: float = 1.0
 
-    def _on_state_changed(self, state: QMediaPlayer.PlaybackState):
-        if state == QMediaPlayer.PlaybackState.StoppedState:
+    def _on_state_changed(self, player: QMediaPlayer, state: QMediaPlayer.PlaybackState):
+        if player is self._current and state == QMediaPlayer.PlaybackState.StoppedState:
             self.playback_finished.emit()
 
     @property
     def is_playing(self) -> bool:
         """Return True if audio is currently playing."""
-        return self._player.playbackState() == QMediaPlayer.PlaybackState.PlayingState
+        return (
+            self._current is not None
+            and self._current.playbackState() == QMediaPlayer.PlaybackState.PlayingState
+        )
 
     @property
     def volume(self) -> float:
@@ -38,7 +54,8 @@ class AudioService(QObject):
     def volume(self, value: float):
         """Set the volume level (0.0 to 1.0)."""
         self._volume = max(0.0, min(1.0, value))
-        self._audio_output.setVolume(self._volume)
+        if self._current is not None:
+            self._current.audioOutput().setVolume(self._volume * self._volume_factor)
 
     @property
     def muted(self) -> bool:
@@ -49,7 +66,55 @@ class AudioService(QObject):
     def muted(self, value: bool):
         """Set the mute state."""
         self._muted = value
-        self._audio_output.setMuted(value)
+        for _, output, _ in self._pool.values():
+            output.setMuted(value)
+
+    def set_normalization(self, file_path: str, buffer_path: str, volume_factor: float):
+        """Play ``buffer_path`` at ``volume_factor`` whenever ``file_path`` is requested.
+
+        Called with the results of LoudnessService, so play() only swaps
+        a source and a volume; it never decodes or analyzes.
+        """
+        self._normalized[file_path] = (buffer_path, volume_factor)
+        entry = self._pool.get(file_path)
+        if entry is not None and entry[0] is not self._current:
+            source, factor = self._source_for(file_path)
+            entry[0].setSource(QUrl.fromLocalFile(source))
+            self._pool[file_path] = (entry[0], entry[1], factor)
+
+    def preload(self, file_path: str) -> bool:
+        """Make sure a player with ``file_path`` loaded is in the pool.
+
+        Returns:
+            False if the file does not exist.
+        """
+        if not file_path or not os.path.exists(file_path):
+            return False
+        if file_path in self._pool:
+            self._pool.move_to_end(file_path)
+            return True
+
+        player = QMediaPlayer(self)
+        output = QAudioOutput(self)
+        output.setMuted(self._muted)
+        player.setAudioOutput(output)
+        player.playbackStateChanged.connect(
+            lambda state, p=player: self._on_state_changed(p, state)
+        )
+        source, factor = self._source_for(file_path)
+        player.setSource(QUrl.fromLocalFile(source))
+        self._pool[file_path] = (player, output, factor)
+        self._evict()
+        return True
+
+    def retain(self, file_paths: list[str]):
+        """Preload ``file_paths`` and evict players for every other file.
+
+        The file playing right now is never evicted.
+        """
+        for path in file_paths:
+            self.preload(path)
+        self._evict(keep=set(file_paths))
 
     def play(self, file_path: str) -> bool:
         """Play the audio file at the given path.
@@ -60,14 +125,40 @@ class AudioService(QObject):
         if self._muted:
             return False
 
-        if not file_path or not os.path.exists(file_path):
+        if not self.preload(file_path):
             return False
 
-        self._audio_output.setVolume(self._volume)
-        self._player.setSource(QUrl.fromLocalFile(file_path))
-        self._player.play()
+        player, output, self._volume_factor = self._pool[file_path]
+        if self._current is not None and self._current is not player:
+            self._current.stop()
+        self._current = player
+
+        output.setVolume(self._volume * self._volume_factor)
+        player.setPosition(0)
+        player.play()
         return True
 
     def stop(self):
         """Stop any currently playing audio."""
-        self._player.stop()
+        if self._current is not None:
+            self._current.stop()
+
+    def _source_for(self, file_path: str) -> tuple[str, float]:
+        """Return the file to load for ``file_path`` and its volume factor."""
+        buffer_path, factor = self._normalized.get(file_path, (None, 1.0))
+        if buffer_path and os.path.exists(buffer_path):
+            return buffer_path, factor
+        return file_path, 1.0
+
+    def _evict(self, keep: set[str] | None = None):
+        """Drop players not in ``keep``, then the least recently used beyond POOL_SIZE."""
+        for path in list(self._pool):
+            player, output, _ = self._pool[path]
+            if player is self._current:
+                continue
+            unwanted = keep is not None and path not in keep
+            if unwanted or len(self._pool) > self.POOL_SIZE:
+                del self._pool[path]
+                player.stop()
+                player.deleteLater()
+                output.deleteLater()
@@ -0,0 +1,75 @@
+"""Circuit breaker that stops calling a failing remote service for a while."""
+
+import threading
+import time
+from collections.abc import Callable
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Counts consecutive failures and short-circuits calls after too many.
+
+    Closed: calls go through. After ``FAILURE_THRESHOLD`` consecutive
+    failures the circuit opens and ``allow()`` refuses calls for
+    ``RESET_TIMEOUT_S``. Then it half-opens and lets one trial call
+    through: success closes it, failure opens it again. Safe to share
+    between threads.
+    """
+
+    FAILURE_THRESHOLD = 3
+    RESET_TIMEOUT_S = 300.0
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout_s: float = RESET_TIMEOUT_S,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._threshold = failure_threshold
+        self._reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        """Return True if a call may be made now (claims the half-open trial)."""
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self._threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if self._clock() - self._opened_at < self._reset_timeout_s:
+            return OPEN
+        return HALF_OPEN
@@ -0,0 +1,56 @@
+"""Frequency and recency of city selections, for predictive prefetching."""
+
+import json
+import math
+import time
+
+
+class CityUsage:
+    """Scores cities by how often and how recently they were selected.
+
+    Each selection adds 1 to a city's score, and every score halves over
+    ``HALF_LIFE_DAYS``, so a city used daily last month ranks below one
+    used a few times this week. Serialized as a compact JSON string for
+    QSettings.
+    """
+
+    HALF_LIFE_DAYS = 14.0
+    MAX_CITIES = 20  # forget the long tail
+
+    def __init__(self, data: str = ""):
+        # city → (score at ``stamp``, stamp)
+        self._scores: dict[str, tuple[float, float]] = {}
+        try:
+            for city, (score, stamp) in json.loads(data or "{}").items():
+                self._scores[city] = (float(score), float(stamp))
+        except (ValueError, TypeError):
+            self._scores = {}
+
+    def record(self, city: str, now: float | None = None) -> None:
+        """Count one selection of ``city``."""
+        now = time.time() if now is None else now
+        self._scores[city] = (self._score(city, now) + 1.0, now)
+        if len(self._scores) > self.MAX_CITIES:
+            weakest = min(self._scores, key=lambda c: self._score(c, now))
+            del self._scores[weakest]
+
+    def top(self, k: int, exclude: str | None = None, now: float | None = None) -> list[str]:
+        """Return the ``k`` highest-scoring cities, best first."""
+        now = time.time() if now is None else now
+        ranked = sorted(
+            (c for c in self._scores if c != exclude),
+            key=lambda c: self._score(c, now),
+            reverse=True,
+        )
+        return ranked[:k]
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {city: [round(score, 4), int(stamp)] for city, (score, stamp) in self._scores.items()},
+            separators=(",", ":"),
+        )
+
+    def _score(self, city: str, now: float) -> float:
+        score, stamp = self._scores.get(city, (0.0, now))
+        age_days = max(0.0, now - stamp) / 86400
+        return score * math.pow(0.5, age_days / self.HALF_LIFE_DAYS)
@@ -0,0 +1,39 @@
+"""Injectable clocks for the scheduling logic."""
+
+import datetime
+import time
+
+
+class SystemClock:
+    """Real wall and monotonic time."""
+
+    def now(self) -> datetime.datetime:
+        """Return the current local wall-clock time."""
+        return datetime.datetime.now()
+
+    def monotonic(self) -> float:
+        """Return seconds from a clock that never jumps."""
+        return time.monotonic()
+
+
+class SimulatedClock:
+    """Manually advanced clock for simulations and time-warp testing."""
+
+    def __init__(self, start: datetime.datetime):
+        self._now = start
+        self._monotonic = 0.0
+
+    def now(self) -> datetime.datetime:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._monotonic
+
+    def advance(self, seconds: float):
+        """Let time pass normally: wall and monotonic move together."""
+        self._now += datetime.timedelta(seconds=seconds)
+        self._monotonic += seconds
+
+    def jump(self, seconds: float):
+        """Step only the wall clock, like a suspend/resume or NTP correction."""
+        self._now += datetime.timedelta(seconds=seconds)
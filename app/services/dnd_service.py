@@ -5,6 +5,8 @@ import os
 import subprocess
 import sys
 
+from app.services.event_log import event_log
+
 
 def is_dnd_enabled() -> bool:
     """Check if the system Do Not Disturb / Focus Assist is active.
@@ -66,7 +68,7 @@ def _check_dnd_windows() -> bool:
             return value != 0
 
     except Exception as e:
-        print(f"DND check (Windows) failed: {e}")
+        event_log.warning("dnd_check_failed", "windows", e)
 
     return False
 
@@ -95,7 +97,7 @@ def _check_dnd_macos() -> bool:
             )
             return len(records) > 0
         except Exception as e:
-            print(f"DND check (macOS 12+ assertions) failed: {e}")
+            event_log.warning("dnd_check_failed", "macos-assertions", e)
 
     # --- macOS < 12 : legacy doNotDisturb defaults key ---
     try:
@@ -113,7 +115,7 @@ def _check_dnd_macos() -> bool:
         )
         return result.stdout.strip() == "1"
     except Exception as e:
-        print(f"DND check (macOS legacy) failed: {e}")
+        event_log.warning("dnd_check_failed", "macos-legacy", e)
 
     return False
 
@@ -0,0 +1,133 @@
+"""In-memory structured event log for diagnosing field issues.
+
+Every record has the same shape: (timestamp, level, event, args). Logging
+stores those four references into a preallocated ring buffer and does no
+formatting or I/O, so it is safe on the adhan trigger path. Text is only
+produced when the buffer is dumped (tray menu or ``--dump-log``) or
+flushed to ``events.log`` in the user data directory, which happens
+lazily from a timer and at exit.
+
+Usage:
+    from app.services.event_log import event_log
+    event_log.warning("update_check_failed", e)
+"""
+
+import datetime
+import itertools
+import os
+import sys
+import threading
+import time
+
+from app.services.storage import user_data_dir
+
+DEBUG, INFO, WARNING, ERROR = range(4)
+LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+
+class EventLog:
+    """Fixed-size ring buffer of structured records."""
+
+    CAPACITY = 2048
+    MAX_FILE_BYTES = 512 * 1024  # events.log is rotated to events.log.1 past this
+
+    def __init__(self, capacity: int = CAPACITY, echo: bool | None = None):
+        self._capacity = capacity
+        self._times = [0.0] * capacity
+        self._levels = [0] * capacity
+        self._events: list[str | None] = [None] * capacity
+        self._args: list[tuple] = [()] * capacity
+        # next() on a count is atomic under the GIL, so threads never share a slot
+        self._counter = itertools.count()
+        # Threads can finish filling their slots out of order; the lock keeps
+        # the high-water mark from moving backwards (held for one max())
+        self._lock = threading.Lock()
+        self._written = 0
+        self._flushed = 0
+        # Keep the old print() behaviour when started from a terminal
+        if echo is None:
+            echo = sys.stderr is not None and sys.stderr.isatty()
+        self._echo = echo
+
+    def log(self, level: int, event: str, *args) -> None:
+        """Record ``event`` with raw ``args``; formatting is deferred."""
+        seq = next(self._counter)
+        slot = seq % self._capacity
+        self._times[slot] = time.time()
+        self._levels[slot] = level
+        self._events[slot] = event
+        self._args[slot] = args
+        with self._lock:
+            self._written = max(self._written, seq + 1)
+        if self._echo:
+            print(self._format(slot), file=sys.stderr)
+
+    def debug(self, event: str, *args) -> None:
+        self.log(DEBUG, event, *args)
+
+    def info(self, event: str, *args) -> None:
+        self.log(INFO, event, *args)
+
+    def warning(self, event: str, *args) -> None:
+        self.log(WARNING, event, *args)
+
+    def error(self, event: str, *args) -> None:
+        self.log(ERROR, event, *args)
+
+    def lines(self, since: int = 0) -> list[str]:
+        """Format the records still in the buffer, oldest first.
+
+        ``since`` skips records with a lower sequence number (used by
+        ``flush`` to write each record once).
+        """
+        return self._lines(since, self._written)
+
+    def dump(self, path: str | None = None) -> str:
+        """Write the whole buffer to a timestamped file and return its path."""
+        if path is None:
+            path = os.path.join(
+                self.log_dir(), f"dump-{datetime.datetime.now():%Y%m%d-%H%M%S}.log"
+            )
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(f"{line}\n" for line in self.lines())
+        return path
+
+    def flush(self) -> None:
+        """Append records not yet on disk to ``events.log``, rotating it when large."""
+        end = self._written
+        if end == self._flushed:
+            return
+        # Same end for the lines and the mark, even if records arrive meanwhile
+        lines = self._lines(self._flushed, end)
+        self._flushed = end
+
+        path = self.file_path()
+        try:
+            if os.path.getsize(path) > self.MAX_FILE_BYTES:
+                os.replace(path, f"{path}.1")
+        except OSError:
+            pass
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(f"{line}\n" for line in lines)
+
+    @staticmethod
+    def log_dir() -> str:
+        path = os.path.join(user_data_dir(), "logs")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def file_path(self) -> str:
+        return os.path.join(self.log_dir(), "events.log")
+
+    def _lines(self, since: int, end: int) -> list[str]:
+        start = max(since, end - self._capacity)
+        return [self._format(seq % self._capacity) for seq in range(start, end)]
+
+    def _format(self, slot: int) -> str:
+        stamp = datetime.datetime.fromtimestamp(self._times[slot])
+        args = " ".join(str(arg) for arg in self._args[slot])
+        return (f"{stamp:%Y-%m-%d %H:%M:%S}.{stamp.microsecond // 1000:03d} "
+                f"{LEVEL_NAMES[self._levels[slot]]:<7} {self._events[slot]} {args}").rstrip()
+
+
+event_log = EventLog()
@@ -0,0 +1,280 @@
+"""Fan-out of prayer events to external sinks (webhook, MQTT, relay, D-Bus).
+
+Each configured sink gets its own bounded queue and worker thread, so a
+slow or dead sink only ever backs up its own queue: publishing is a
+non-blocking put and never delays the adhan audio or the Qt event loop.
+Sinks are configured in ``sinks.json`` in the user data directory, e.g.:
+
+    [
+        {"type": "webhook", "url": "http://192.168.1.10/adzan", "timeout": 2},
+        {"type": "mqtt", "host": "localhost", "topic": "masjid/adzan"},
+        {"type": "relay", "host": "192.168.1.20", "port": 5000, "payload": "ON"},
+        {"type": "dbus"}
+    ]
+"""
+
+import abc
+import datetime
+import json
+import os
+import queue
+import socket
+import string
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+
+import requests
+
+from app.services.event_log import event_log
+from app.services.storage import user_data_dir
+
+
+@dataclass
+class PrayerEvent:
+    """A prayer trigger as seen by external sinks."""
+
+    prayer: str
+    city: str
+    scheduled: str
+    audio_played: bool
+    fired_at: datetime.datetime = field(default_factory=datetime.datetime.now)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["fired_at"] = self.fired_at.isoformat(timespec="seconds")
+        return data
+
+
+class EventSink(abc.ABC):
+    """Base class for a destination of prayer events."""
+
+    kind = "sink"
+
+    def __init__(self, timeout: float = 2.0, retries: int = 2, name: str | None = None):
+        self.timeout = timeout
+        self.retries = retries
+        self.name = name or self.kind
+
+    @abc.abstractmethod
+    def deliver(self, event: PrayerEvent) -> None:
+        """Send one event, raising on failure. Must honour ``self.timeout``."""
+
+
+class WebhookSink(EventSink):
+    """POSTs the event as JSON to an HTTP endpoint."""
+
+    kind = "webhook"
+
+    def __init__(self, url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+
+    def deliver(self, event: PrayerEvent) -> None:
+        resp = requests.post(self.url, json=event.to_dict(), timeout=self.timeout)
+        resp.raise_for_status()
+
+
+class MqttSink(EventSink):
+    """Publishes the event as JSON to an MQTT broker.
+
+    Needs the optional paho-mqtt >= 2.0 (``requirements-mqtt.txt``).
+    """
+
+    kind = "mqtt"
+
+    def __init__(self, host: str = "localhost", port: int = 1883,
+                 topic: str = "adzanid/prayer", **kwargs):
+        super().__init__(**kwargs)
+        self.host = host
+        self.port = port
+        self.topic = topic
+
+    def deliver(self, event: PrayerEvent) -> None:
+        from paho.mqtt import client as mqtt
+
+        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        client.connect_timeout = self.timeout  # bounds the TCP connect
+        client.connect(self.host, self.port)
+        client.loop_start()
+        try:
+            # QoS 1 so the wait ends only once the broker has the message
+            info = client.publish(self.topic, json.dumps(event.to_dict()), qos=1)
+            info.wait_for_publish(timeout=self.timeout)
+            if not info.is_published():
+                raise TimeoutError(f"MQTT broker {self.host} did not acknowledge")
+        finally:
+            client.disconnect()
+            client.loop_stop()
+
+
+class RelaySink(EventSink):
+    """Writes a payload to a TCP relay controller.
+
+    ``$prayer``, ``$city``, ``$scheduled`` and ``$fired_at`` in the
+    payload are replaced by the event's values; anything else (such as
+    the braces of a JSON payload) is sent as written.
+    """
+
+    kind = "relay"
+
+    def __init__(self, host: str, port: int, payload: str = "ON\n", **kwargs):
+        super().__init__(**kwargs)
+        self.host = host
+        self.port = port
+        self.payload = payload
+
+    def deliver(self, event: PrayerEvent) -> None:
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as conn:
+            payload = string.Template(self.payload).safe_substitute(event.to_dict())
+            conn.sendall(payload.encode("utf-8"))
+
+
+class DBusSink(EventSink):
+    """Emits a session D-Bus signal ``id.fikrisyahid.Adzanid.PrayerTime``."""
+
+    kind = "dbus"
+
+    def deliver(self, event: PrayerEvent) -> None:
+        subprocess.run(
+            [
+                "dbus-send",
+                "--session",
+                "--type=signal",
+                "/id/fikrisyahid/Adzanid",
+                "id.fikrisyahid.Adzanid.PrayerTime",
+                f"string:{event.prayer}",
+                f"string:{event.city}",
+                f"string:{event.scheduled}",
+            ],
+            check=True,
+            capture_output=True,
+            timeout=self.timeout,
+        )
+
+
+SINK_TYPES = {cls.kind: cls for cls in (WebhookSink, MqttSink, RelaySink, DBusSink)}
+
+
+def load_sinks(path: str | None = None) -> list[EventSink]:
+    """Build sinks from the JSON config; a missing file means no sinks."""
+    path = path or os.path.join(user_data_dir(), "sinks.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        event_log.warning("sink_config_invalid", path, e)
+        return []
+
+    if not isinstance(config, list):
+        event_log.warning("sink_config_invalid", path, "expected a list of sinks")
+        return []
+
+    sinks = []
+    for entry in config:
+        if not isinstance(entry, dict):
+            event_log.warning("sink_config_invalid", path, entry)
+            continue
+        options = dict(entry)
+        kind = options.pop("type", None)
+        if kind not in SINK_TYPES:
+            event_log.warning("sink_type_unknown", kind)
+            continue
+        try:
+            sinks.append(SINK_TYPES[kind](**options))
+        except TypeError as e:
+            event_log.warning("sink_options_invalid", kind, e)
+    return sinks
+
+
+class _SinkWorker:
+    """Owns one sink's queue, thread, retry loop and latency record."""
+
+    RETRY_BACKOFF_S = 0.5
+
+    def __init__(self, sink: EventSink, queue_size: int):
+        self.sink = sink
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.latencies_ms: deque[float] = deque(maxlen=100)
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self._thread = threading.Thread(
+            target=self._run, name=f"sink-{sink.name}", daemon=True
+        )
+        self._thread.start()
+
+    def offer(self, event: PrayerEvent, enqueued: float):
+        try:
+            self.queue.put_nowait((event, enqueued))
+        except queue.Full:
+            # Keep the newest events: drop the oldest one and retry once
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+                self.queue.put_nowait((event, enqueued))
+            except (queue.Empty, queue.Full):
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            event, enqueued = item
+            for attempt in range(self.sink.retries + 1):
+                try:
+                    self.sink.deliver(event)
+                except Exception as e:
+                    if attempt == self.sink.retries:
+                        self.failed += 1
+                        event_log.warning("sink_failed", self.sink.name, e)
+                    else:
+                        time.sleep(self.RETRY_BACKOFF_S * 2 ** attempt)
+                    continue
+                self.delivered += 1
+                self.latencies_ms.append((time.perf_counter() - enqueued) * 1000)
+                break
+
+    def stop(self):
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            pass  # daemon thread; it dies with the process
+
+
+class EventDispatcher:
+    """Publishes events to every sink without ever blocking the caller."""
+
+    QUEUE_SIZE = 32
+
+    def __init__(self, sinks: list[EventSink], queue_size: int = QUEUE_SIZE):
+        self._workers = [_SinkWorker(sink, queue_size) for sink in sinks]
+
+    def publish(self, event: PrayerEvent) -> None:
+        """Enqueue ``event`` for every sink and return immediately."""
+        enqueued = time.perf_counter()
+        for worker in self._workers:
+            worker.offer(event, enqueued)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Return per-sink delivery counts and latency (enqueue → delivered)."""
+        result = {}
+        for worker in self._workers:
+            latencies = sorted(worker.latencies_ms)
+            result[worker.sink.name] = {
+                "delivered": worker.delivered,
+                "failed": worker.failed,
+                "dropped": worker.dropped,
+                "p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+                "max_ms": latencies[-1] if latencies else 0.0,
+            }
+        return result
+
+    def stop(self) -> None:
+        for worker in self._workers:
+            worker.stop()
@@ -0,0 +1,71 @@
+"""Tabular (arithmetic) Hijri calendar, computed locally.
+
+Uses the common 30-year cycle with leap years 2, 5, 7, 10, 13, 16, 18,
+21, 24, 26 and 29 (the "Kuwaiti" variant) and the civil epoch of
+16 July 622 (Julian). The official Indonesian dates are set by rukyat
+and the isbat session, which can land a day either side of the tabular
+date, so every function takes an ``adjust`` in days (as the Kemenag
+calendar is usually one day later, ``adjust=-1`` is a common setting).
+"""
+
+import datetime
+import math
+
+MONTH_NAMES = (
+    "Muharram", "Safar", "Rabiul Awal", "Rabiul Akhir",
+    "Jumadil Awal", "Jumadil Akhir", "Rajab", "Syaban",
+    "Ramadan", "Syawal", "Zulkaidah", "Zulhijah",
+)
+RAMADAN = 9
+
+# Ordinal (datetime.date.toordinal) of 1 Muharram 1 AH, 16 July 622 Julian
+_EPOCH = datetime.date(622, 7, 19).toordinal()
+
+
+def _days_before(year: int, month: int) -> int:
+    """Days from the epoch to the first of ``month`` in ``year``."""
+    return (
+        (year - 1) * 354
+        + (3 + 11 * year) // 30
+        + math.ceil(29.5 * (month - 1))
+    )
+
+
+def month_length(year: int, month: int) -> int:
+    """Return 29 or 30; Zulhijah has 30 days in leap years."""
+    if month == 12:
+        return 30 if (14 + 11 * year) % 30 < 11 else 29
+    return 30 if month % 2 else 29
+
+
+def to_gregorian(year: int, month: int, day: int, adjust: int = 0) -> datetime.date:
+    """Convert a Hijri date to a Gregorian date."""
+    return datetime.date.fromordinal(_EPOCH + _days_before(year, month) + day - 1 - adjust)
+
+
+def to_hijri(date: datetime.date, adjust: int = 0) -> tuple[int, int, int]:
+    """Convert a Gregorian date to a Hijri (year, month, day)."""
+    days = date.toordinal() + adjust - _EPOCH
+    year = (30 * days + 10646) // 10631
+    month = min(12, (days - _days_before(year, 1)) * 2 // 59 + 1)
+    while month > 1 and _days_before(year, month) > days:
+        month -= 1
+    return year, month, days - _days_before(year, month) + 1
+
+
+def format_hijri(date: datetime.date, adjust: int = 0) -> str:
+    """Return e.g. "1 Ramadan 1447 H"."""
+    year, month, day = to_hijri(date, adjust)
+    return f"{day} {MONTH_NAMES[month - 1]} {year} H"
+
+
+def ramadan(hijri_year: int, adjust: int = 0) -> tuple[datetime.date, int]:
+    """Return the first day of Ramadan of ``hijri_year`` and its length."""
+    return to_gregorian(hijri_year, RAMADAN, 1, adjust), month_length(hijri_year, RAMADAN)
+
+
+def ramadan_in(gregorian_year: int, adjust: int = 0) -> list[tuple[datetime.date, int]]:
+    """Return every Ramadan starting in ``gregorian_year`` (one, rarely two)."""
+    first = to_hijri(datetime.date(gregorian_year, 1, 1), adjust)[0]
+    starts = [ramadan(year, adjust) for year in (first, first + 1)]
+    return [(start, days) for start, days in starts if start.year == gregorian_year]
@@ -0,0 +1,429 @@
+"""Background loudness analysis and decoded-buffer cache for adhan files.
+
+When the user picks an audio file, it is decoded once with QAudioDecoder,
+its gated loudness and peak are measured as the decoded blocks arrive,
+and a WAV copy with a short fade-in (and any safe boost already applied)
+is written to the cache. AudioService then plays the cached WAV with the
+remaining attenuation as a volume factor, so nothing is decoded or
+analyzed when an adhan fires.
+
+Buffers are keyed by the file's SHA-256, so a copy or a renamed file
+reuses them; each path is revalidated by its size and mtime.
+"""
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+import warnings
+import wave
+from array import array
+from dataclasses import asdict, dataclass
+
+from PyQt6.QtCore import QObject, QUrl, pyqtSignal
+from PyQt6.QtMultimedia import QAudioDecoder, QAudioFormat
+
+from app.services.event_log import event_log
+from app.services.storage import atomic_write, user_data_dir
+
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        # C-speed gain; removed from the stdlib in Python 3.13, where the
+        # audioop-lts backport (requirements.txt) provides the same module
+        import audioop
+except ImportError:
+    audioop = None
+
+
+@dataclass
+class LoudnessInfo:
+    """Measured loudness of one audio file and how to normalize it."""
+
+    sha256: str
+    size: int
+    mtime: float
+    loudness_db: float
+    peak_db: float
+    gain_db: float
+    buffer_path: str
+    volume_factor: float
+
+
+class _LoudnessMeter:
+    """Gated loudness and peak of interleaved Int16 audio fed in pieces.
+
+    Follows the BS.1770 gating scheme (400 ms blocks, absolute and
+    relative gates) on a strided mono mix, without K-weighting. Only one
+    energy per finished block is kept, never the samples.
+    """
+
+    FULL_SCALE = 32768.0
+
+    def __init__(self, block: int, stride: int):
+        self._block = block  # decimated samples per gating block
+        self._stride = stride  # interleaved samples per decimated sample
+        self._skip = 0  # index of the next decimated sample in the next piece
+        self._pending = array("h")
+        self._energies: list[float] = []
+        self._peak = 0
+
+    def add(self, samples: array) -> None:
+        if not samples:
+            return
+        self._peak = max(self._peak, max(samples), -min(samples))
+        # First channel, decimated (C-level slice), continuing across pieces
+        self._pending.extend(samples[self._skip::self._stride])
+        self._skip = (self._skip - len(samples)) % self._stride
+
+        block = self._block
+        full = len(self._pending) - len(self._pending) % block
+        for start in range(0, full, block):
+            chunk = self._pending[start:start + block]
+            self._energies.append(math.fsum(map(int.__mul__, chunk, chunk))
+                                  / (block * self.FULL_SCALE * self.FULL_SCALE))
+        del self._pending[:full]
+
+    def result(self, absolute_gate_db: float, relative_gate_db: float) -> tuple[float, float]:
+        """Return (gated loudness dBFS, peak dBFS) of everything added."""
+
+        def to_db(energy: float) -> float:
+            return 10 * math.log10(energy) if energy > 0 else -120.0
+
+        peak = min(self._peak, 32767) / self.FULL_SCALE
+        gated = [e for e in self._energies if to_db(e) > absolute_gate_db]
+        if not gated:
+            return -120.0, to_db(peak * peak)
+        relative = to_db(sum(gated) / len(gated)) + relative_gate_db
+        gated = [e for e in gated if to_db(e) > relative] or gated
+        return to_db(sum(gated) / len(gated)), to_db(peak * peak)
+
+
+class LoudnessService(QObject):
+    """Analyzes audio files off the trigger path and caches the results."""
+
+    analyzed = pyqtSignal(str, object)  # source path, LoudnessInfo
+    _identified = pyqtSignal(str, object)  # worker → main: path, (sha256, size, mtime)
+    _analysis_done = pyqtSignal(str, object)  # worker thread → main thread
+
+    TARGET_LOUDNESS_DB = -18.0
+    MAX_BOOST_DB = 12.0
+    MAX_CUT_DB = -24.0
+    FADE_IN_S = 1.5
+    # The fade is applied in constant-gain steps this long (C-speed gain)
+    FADE_STEP_S = 0.01
+    BLOCK_S = 0.4
+    ABSOLUTE_GATE_DB = -70.0
+    RELATIVE_GATE_DB = -10.0
+    # Analyze every Nth frame; loudness is stable well below 44.1 kHz
+    ANALYSIS_STRIDE = 4
+    MAX_CACHED_BUFFERS = 6
+    # Samples processed per step when writing a buffer (bounds peak memory)
+    WRITE_CHUNK_SAMPLES = 1 << 16
+
+    SAMPLE_RATE = 44100
+    CHANNELS = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._dir = os.path.join(user_data_dir(), "audio_cache")
+        os.makedirs(self._dir, exist_ok=True)
+        self._index_path = os.path.join(self._dir, "index.json")
+        # sha256 → LoudnessInfo fields, least recently used first; and
+        # source path → {"sha256", "size", "mtime"} of the file when hashed
+        self._buffers: dict[str, dict] = {}
+        self._paths: dict[str, dict] = {}
+        self._load_index()
+        self._identified.connect(self._on_identified)
+        self._analysis_done.connect(self._store)
+        self._decoder: QAudioDecoder | None = None
+        self._pending: str | None = None
+        self._pending_id: tuple[str, int, float] | None = None
+        self._queue: list[str] = []
+        self._meter: _LoudnessMeter | None = None
+        self._spool = None  # decoded PCM, written as it arrives
+        self._spool_path: str | None = None
+
+    def cached(self, path: str) -> LoudnessInfo | None:
+        """Return the analysis for ``path`` if it is still valid."""
+        ident = self._paths.get(path)
+        if ident is None:
+            return None
+        entry = self._buffers.get(ident["sha256"])
+        if entry is None or not os.path.exists(entry["buffer_path"]):
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size != ident["size"] or stat.st_mtime != ident["mtime"]:
+            return None
+        return LoudnessInfo(**{**entry, "size": ident["size"], "mtime": ident["mtime"]})
+
+    def analyze(self, path: str) -> None:
+        """Emit ``analyzed`` for ``path``, decoding it in the background if needed.
+
+        Files are hashed and decoded one at a time; requests made while
+        one is running are queued.
+        """
+        info = self.cached(path)
+        if info is not None:
+            self.analyzed.emit(path, info)
+            return
+        if not path or not os.path.exists(path):
+            return
+        if path == self._pending or path in self._queue:
+            return
+        self._queue.append(path)
+        if self._pending is None:
+            self._start_next()
+
+    def _start_next(self):
+        if self._decoder is not None:
+            # A failed decoder may still emit; nothing of it must reach us
+            for signal in (self._decoder.bufferReady, self._decoder.finished,
+                           self._decoder.error):
+                signal.disconnect()
+            self._decoder.deleteLater()
+            self._decoder = None
+        self._pending = self._pending_id = None
+        if not self._queue:
+            return
+        self._pending = self._queue.pop(0)
+        threading.Thread(target=self._identify, args=(self._pending,), daemon=True).start()
+
+    def _identify(self, path: str):
+        """Hash ``path`` (worker thread) so known content skips decoding."""
+        try:
+            stat = os.stat(path)
+            ident = (self._hash_file(path), stat.st_size, stat.st_mtime)
+        except OSError as e:
+            event_log.warning("audio_hash_failed", path, e)
+            ident = None
+        self._identified.emit(path, ident)
+
+    def _on_identified(self, path: str, ident):
+        if path != self._pending:
+            return
+        if ident is None:
+            self._start_next()
+            return
+        sha256, size, mtime = ident
+        entry = self._buffers.get(sha256)
+        if entry is not None and os.path.exists(entry["buffer_path"]):
+            # Same audio under another path, or touched without changes
+            self._store(path, LoudnessInfo(**{**entry, "size": size, "mtime": mtime}))
+            self._start_next()
+            return
+
+        self._pending_id = ident
+        fd, self._spool_path = tempfile.mkstemp(suffix=".pcm", dir=self._dir)
+        self._spool = os.fdopen(fd, "wb")
+        self._meter = _LoudnessMeter(
+            block=max(1, int(self.SAMPLE_RATE / self.ANALYSIS_STRIDE * self.BLOCK_S)),
+            stride=self.CHANNELS * self.ANALYSIS_STRIDE,
+        )
+
+        fmt = QAudioFormat()
+        fmt.setSampleRate(self.SAMPLE_RATE)
+        fmt.setChannelCount(self.CHANNELS)
+        fmt.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+
+        self._decoder = QAudioDecoder(self)
+        self._decoder.setAudioFormat(fmt)
+        self._decoder.bufferReady.connect(self._on_buffer_ready)
+        self._decoder.finished.connect(self._on_decoded)
+        self._decoder.error.connect(self._on_decode_error)
+        self._decoder.setSource(QUrl.fromLocalFile(path))
+        self._decoder.start()
+
+    # ------------------------------------------------------------------
+    # Decoding (main thread, one decoded block at a time)
+    # ------------------------------------------------------------------
+
+    def _on_buffer_ready(self):
+        if self.sender() is not self._decoder:
+            return
+        buffer = self._decoder.read()
+        data = bytes(buffer.constData().asarray(buffer.byteCount()))
+        samples = array("h")
+        samples.frombytes(data)
+        self._meter.add(samples)
+        try:
+            self._spool.write(data)
+        except OSError as e:
+            event_log.warning("audio_spool_failed", self._pending, e)
+            self._discard_spool()
+            self._start_next()
+
+    def _on_decode_error(self, error):
+        if self.sender() is not self._decoder:
+            return
+        event_log.warning("audio_decode_failed", self._pending, self._decoder.errorString())
+        self._discard_spool()
+        self._start_next()
+
+    def _on_decoded(self):
+        if self.sender() is not self._decoder:
+            return
+        path, ident, meter = self._pending, self._pending_id, self._meter
+        spool_path = self._spool_path
+        self._spool.close()
+        self._spool = self._spool_path = self._meter = None
+        threading.Thread(
+            target=self._analyze_samples, args=(path, ident, meter, spool_path), daemon=True
+        ).start()
+        self._start_next()
+
+    def _discard_spool(self):
+        if self._spool is None:
+            return
+        self._spool.close()
+        try:
+            os.remove(self._spool_path)
+        except OSError:
+            pass
+        self._spool = self._spool_path = self._meter = None
+
+    # ------------------------------------------------------------------
+    # Analysis (worker thread)
+    # ------------------------------------------------------------------
+
+    def _analyze_samples(self, path: str, ident: tuple[str, int, float],
+                         meter: _LoudnessMeter, spool_path: str):
+        sha256, size, mtime = ident
+        try:
+            loudness_db, peak_db = meter.result(self.ABSOLUTE_GATE_DB, self.RELATIVE_GATE_DB)
+            gain_db = max(self.MAX_CUT_DB,
+                          min(self.MAX_BOOST_DB, self.TARGET_LOUDNESS_DB - loudness_db))
+            # Boost is baked into the buffer (QAudioOutput can't exceed 1.0),
+            # limited so the peak never clips; any cut stays a volume factor.
+            baked_db = max(0.0, min(gain_db, -peak_db))
+            volume_factor = 10 ** (min(0.0, gain_db - baked_db) / 20)
+
+            buffer_path = os.path.join(self._dir, f"{sha256}.wav")
+            self._write_buffer(buffer_path, spool_path, 10 ** (baked_db / 20))
+
+            info = LoudnessInfo(
+                sha256=sha256,
+                size=size,
+                mtime=mtime,
+                loudness_db=round(loudness_db, 2),
+                peak_db=round(peak_db, 2),
+                gain_db=round(gain_db, 2),
+                buffer_path=buffer_path,
+                volume_factor=volume_factor,
+            )
+        except Exception as e:
+            event_log.warning("loudness_analysis_failed", path, e)
+            return
+        finally:
+            try:
+                os.remove(spool_path)
+            except OSError:
+                pass
+        self._analysis_done.emit(path, info)
+
+    def _store(self, path: str, info: LoudnessInfo):
+        entry = asdict(info)
+        self._buffers.pop(info.sha256, None)  # re-insert as newest
+        self._buffers[info.sha256] = entry
+        self._paths[path] = {key: entry[key] for key in ("sha256", "size", "mtime")}
+        self._evict()
+        self._save_index()
+        self.analyzed.emit(path, info)
+
+    def _write_buffer(self, path: str, spool_path: str, gain: float):
+        """Write the spooled PCM with ``gain`` and the fade-in as a WAV file.
+
+        Works through ``WRITE_CHUNK_SAMPLES`` at a time, so memory stays at
+        one chunk whatever the track length.
+        """
+        frame_bytes = 2 * self.CHANNELS
+        fade_frames = int(self.SAMPLE_RATE * self.FADE_IN_S)
+
+        tmp_path = f"{path}.tmp"
+        with open(spool_path, "rb") as src, wave.open(tmp_path, "wb") as wav:
+            wav.setnchannels(self.CHANNELS)
+            wav.setsampwidth(2)
+            wav.setframerate(self.SAMPLE_RATE)
+            frame = 0
+            for data in iter(lambda: src.read(self.WRITE_CHUNK_SAMPLES * 2), b""):
+                if frame < fade_frames:
+                    wav.writeframes(self._fade_in(data, frame, fade_frames, gain))
+                else:
+                    wav.writeframes(self._apply_gain(data, gain))
+                frame += len(data) // frame_bytes
+        os.replace(tmp_path, path)
+
+    def _fade_in(self, data: bytes, frame: int, fade_frames: int, gain: float) -> bytes:
+        """Scale ``data``, starting at ``frame``, by ``gain`` and the fade-in ramp.
+
+        The ramp rises from silence in ``FADE_STEP_S`` steps, each applied
+        to its slice with one ``_apply_gain`` call.
+        """
+        frame_bytes = 2 * self.CHANNELS
+        step = max(1, int(self.SAMPLE_RATE * self.FADE_STEP_S))
+        parts = []
+        pos = 0
+        while pos < len(data) and frame < fade_frames:
+            n = min(step - frame % step, fade_frames - frame)
+            end = pos + n * frame_bytes
+            parts.append(self._apply_gain(data[pos:end], gain * frame / fade_frames))
+            frame += n
+            pos = end
+        parts.append(self._apply_gain(data[pos:], gain))
+        return b"".join(parts)
+
+    @staticmethod
+    def _apply_gain(data: bytes, gain: float) -> bytes:
+        # The baked gain is limited by the peak, so results stay in range
+        if gain == 1.0 or not data:
+            return data
+        if audioop is not None:
+            return audioop.mul(data, 2, gain)
+        samples = array("h")
+        samples.frombytes(data)
+        return array("h", map(int, map(gain.__mul__, samples))).tobytes()
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Index persistence
+    # ------------------------------------------------------------------
+
+    def _evict(self):
+        """Drop the oldest buffers beyond MAX_CACHED_BUFFERS."""
+        while len(self._buffers) > self.MAX_CACHED_BUFFERS:
+            sha256 = next(iter(self._buffers))
+            entry = self._buffers.pop(sha256)
+            self._paths = {
+                path: ident for path, ident in self._paths.items()
+                if ident["sha256"] != sha256
+            }
+            try:
+                os.remove(entry["buffer_path"])
+            except OSError:
+                pass
+
+    def _load_index(self):
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            # An index from before buffers were keyed by hash has neither key
+            self._buffers = dict(index["buffers"])
+            self._paths = dict(index["paths"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._buffers, self._paths = {}, {}
+
+    def _save_index(self):
+        index = {"buffers": self._buffers, "paths": self._paths}
+        atomic_write(self._index_path, json.dumps(index).encode("utf-8"))
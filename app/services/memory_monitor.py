@@ -0,0 +1,186 @@
+"""Opt-in memory monitor for the long-running tray process.
+
+Enabled with ``ADZANID_MEMORY_MONITOR=1`` or the ``memory_monitor``
+setting. Every sample records the process RSS and a ``tracemalloc``
+snapshot; the growth since the previous snapshot is grouped by module
+(``app.services.audio_service``, ``app.ui.schedule_tab``, ``PyQt6``, ...).
+A module whose traced size, or the RSS, grows on every one of the last
+``GROWTH_WINDOW`` samples is flagged in the event log. ``report()``
+returns the RSS history, per-module totals and the top allocation sites.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+from functools import lru_cache
+
+from app.services.event_log import event_log
+
+ENV_VAR = "ADZANID_MEMORY_MONITOR"
+
+# Root of the source tree, for turning file names into module names
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def enabled(setting: bool = False) -> bool:
+    """Return True if monitoring is requested by the environment or setting."""
+    return os.environ.get(ENV_VAR, "") not in ("", "0") or setting
+
+
+def current_rss() -> int | None:
+    """Return the resident set size in bytes, or None if unavailable."""
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class Counters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = Counters()
+            counters.cb = ctypes.sizeof(counters)
+            ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(),
+                ctypes.byref(counters),
+                counters.cb,
+            )
+            return counters.WorkingSetSize
+        # macOS: ru_maxrss is the peak (in bytes there), the closest stdlib figure
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except (OSError, ValueError, AttributeError, ImportError):
+        return None
+
+
+@lru_cache(maxsize=1024)
+def module_of(filename: str) -> str:
+    """Map a traced file name to a dotted module (app code) or a package name."""
+    path = os.path.abspath(filename)
+    if path.startswith(_ROOT + os.sep):
+        rel = os.path.relpath(path, _ROOT)
+        return os.path.splitext(rel)[0].replace(os.sep, ".")
+    parts = path.split(os.sep)
+    if "site-packages" in parts:
+        return parts[parts.index("site-packages") + 1]
+    return "<stdlib>" if path.endswith(".py") else "<other>"
+
+
+class MemoryMonitor:
+    """Samples RSS and tracemalloc diffs and flags steady growth."""
+
+    INTERVAL_S = 600
+    GROWTH_WINDOW = 6
+    TOP_N = 15
+    FRAMES = 1  # one frame per trace keeps tracemalloc overhead low
+    # Growth smaller than this over the whole window is noise, not a leak
+    MIN_GROWTH_BYTES = 256 * 1024
+
+    def __init__(self, frames: int = FRAMES, window: int = GROWTH_WINDOW):
+        self._frames = frames
+        self._window = window
+        self._rss: deque[tuple[float, int]] = deque(maxlen=window)
+        self._modules: dict[str, deque[int]] = {}
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._last_diff: dict[str, int] = {}
+        self._flagged: set[str] = set()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+        self.sample()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._snapshot = None
+
+    def sample(self) -> None:
+        """Take one RSS reading and snapshot, and log any steady growth."""
+        rss = current_rss()
+        if rss is not None:
+            self._rss.append((time.time(), rss))
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        totals: dict[str, int] = {}
+        for stat in snapshot.statistics("filename"):
+            name = module_of(stat.traceback[0].filename)
+            totals[name] = totals.get(name, 0) + stat.size
+
+        if self._snapshot is not None:
+            self._last_diff = {}
+            for stat in snapshot.compare_to(self._snapshot, "filename"):
+                name = module_of(stat.traceback[0].filename)
+                self._last_diff[name] = self._last_diff.get(name, 0) + stat.size_diff
+        self._snapshot = snapshot
+
+        for name, size in totals.items():
+            self._modules.setdefault(name, deque(maxlen=self._window)).append(size)
+        for name in set(self._modules) - set(totals):
+            self._modules[name].append(0)
+
+        event_log.debug("memory_sample", rss, sum(totals.values()))
+        self._check_growth("rss", [value for _, value in self._rss])
+        for name, history in self._modules.items():
+            self._check_growth(name, history)
+
+    def _check_growth(self, name: str, history) -> None:
+        history = list(history)
+        growing = (
+            len(history) == self._window
+            and all(b > a for a, b in zip(history, history[1:]))
+            and history[-1] - history[0] >= self.MIN_GROWTH_BYTES
+        )
+        if growing and name not in self._flagged:
+            self._flagged.add(name)
+            event_log.warning("memory_growth", name, history[0], history[-1])
+        elif not growing:
+            self._flagged.discard(name)
+
+    @property
+    def flagged(self) -> set[str]:
+        """Names (modules or "rss") currently growing on every sample."""
+        return set(self._flagged)
+
+    def report(self, top_n: int = TOP_N) -> str:
+        """Return a text report of RSS, per-module sizes and top allocations."""
+        lines = ["RSS history:"]
+        for stamp, rss in self._rss:
+            lines.append(f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(stamp))}"
+                         f"  {rss / 1048576:8.1f} MiB")
+
+        lines.append("")
+        lines.append("Traced size by module (change since previous sample):")
+        current = {name: history[-1] for name, history in self._modules.items()}
+        for name, size in sorted(current.items(), key=lambda kv: -kv[1])[:top_n]:
+            flag = "  GROWING" if name in self._flagged else ""
+            lines.append(f"  {size / 1024:10.1f} KiB  {self._last_diff.get(name, 0) / 1024:+9.1f} KiB"
+                         f"  {name}{flag}")
+
+        if self._snapshot is not None:
+            lines.append("")
+            lines.append(f"Top {top_n} allocation sites:")
+            for stat in self._snapshot.statistics("lineno")[:top_n]:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size / 1024:10.1f} KiB  {stat.count:7d} blocks"
+                             f"  {module_of(frame.filename)}:{frame.lineno}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,202 @@
+"""Local astronomical prayer time calculation (no network).
+
+Implements the same PrayTimes algorithm the Aladhan API uses, so results
+for a given method and tune are meant to match ``PrayerTimeService.fetch``
+to the minute for the tropical latitudes of Indonesia;
+``scripts/check_accuracy.py`` measures it against recorded API results.
+"""
+
+import datetime
+import math
+
+# Order of the comma-separated offsets in an Aladhan ``tune`` string
+TUNE_KEYS = (
+    "Imsak", "Fajr", "Sunrise", "Dhuhr", "Asr",
+    "Maghrib", "Sunset", "Isha", "Midnight",
+)
+
+# Twilight angles per Aladhan method id: (fajr_angle, isha_angle)
+METHOD_ANGLES = {
+    20: (20.0, 18.0),  # Kementerian Agama Republik Indonesia
+}
+
+# Keys returned by compute_times, in chronological order
+TIME_KEYS = ("Imsak", "Fajr", "Sunrise", "Dhuhr", "Asr", "Sunset", "Maghrib", "Isha")
+
+# TIME_KEYS plus Dhuha, which Aladhan doesn't return; computed on request only
+# so cached and packed schedules keep their eight API columns
+EXTENDED_KEYS = ("Imsak", "Fajr", "Sunrise", "Dhuha", "Dhuhr", "Asr", "Sunset", "Maghrib", "Isha")
+
+IMSAK_MINUTES_BEFORE_FAJR = 10
+RISE_SET_ANGLE = 0.833
+# Kemenag's Dhuha: the sun 4.5° above the eastern horizon
+DHUHA_ALTITUDE = 4.5
+
+
+def parse_tune(tune: str) -> dict[str, int]:
+    """Parse an Aladhan tune string into per-key minute offsets."""
+    values = [int(part) for part in tune.split(",")] if tune else []
+    values += [0] * (len(TUNE_KEYS) - len(values))
+    return dict(zip(TUNE_KEYS, values))
+
+
+def utc_offset_for(lat: float, lng: float) -> int:
+    """Return the Indonesian zone offset (WIB/WITA/WIT) for a coordinate.
+
+    The WIB/WITA boundary runs between Banyuwangi and Bali and between
+    Central and South Kalimantan; WIT covers Maluku and Papua.
+    """
+    if lng < 114.5:
+        return 7
+    if lng < 126.0:
+        return 8
+    return 9
+
+
+# ------------------------------------------------------------------
+# Astronomy helpers (degrees in, degrees out)
+# ------------------------------------------------------------------
+
+def _sin(d: float) -> float:
+    return math.sin(math.radians(d))
+
+
+def _cos(d: float) -> float:
+    return math.cos(math.radians(d))
+
+
+def _tan(d: float) -> float:
+    return math.tan(math.radians(d))
+
+
+def _arcsin(x: float) -> float:
+    return math.degrees(math.asin(x))
+
+
+def _arccos(x: float) -> float:
+    return math.degrees(math.acos(max(-1.0, min(1.0, x))))
+
+
+def _arccot(x: float) -> float:
+    return math.degrees(math.atan(1.0 / x))
+
+
+def _fix(value: float, mod: float) -> float:
+    value = value - mod * math.floor(value / mod)
+    return value + mod if value < 0 else value
+
+
+def _julian(date: datetime.date) -> float:
+    year, month = date.year, date.month
+    if month <= 2:
+        year -= 1
+        month += 12
+    a = year // 100
+    b = 2 - a + a // 4
+    return (
+        math.floor(365.25 * (year + 4716))
+        + math.floor(30.6001 * (month + 1))
+        + date.day + b - 1524.5
+    )
+
+
+def _sun_position(jd: float) -> tuple[float, float]:
+    """Return (declination, equation of time) for a Julian date."""
+    d = jd - 2451545.0
+    g = _fix(357.529 + 0.98560028 * d, 360.0)
+    q = _fix(280.459 + 0.98564736 * d, 360.0)
+    ecl_lng = _fix(q + 1.915 * _sin(g) + 0.020 * _sin(2 * g), 360.0)
+    obliquity = 23.439 - 0.00000036 * d
+
+    right_asc = math.degrees(
+        math.atan2(_cos(obliquity) * _sin(ecl_lng), _cos(ecl_lng))
+    ) / 15.0
+    equation = q / 15.0 - _fix(right_asc, 24.0)
+    declination = _arcsin(_sin(obliquity) * _sin(ecl_lng))
+    return declination, equation
+
+
+def compute_times(
+    date: datetime.date,
+    lat: float,
+    lng: float,
+    utc_offset: float,
+    method: int = 20,
+    keys: tuple[str, ...] = TIME_KEYS,
+) -> dict[str, float]:
+    """Compute untuned, unrounded prayer times in local hours.
+
+    Values are not wrapped into 0–24, so callers working in UTC
+    (``utc_offset=0``) keep a continuous timeline. ``keys`` may be any
+    subset of ``EXTENDED_KEYS``.
+    """
+    fajr_angle, isha_angle = METHOD_ANGLES[method]
+    jdate = _julian(date) - lng / (15 * 24.0)
+
+    def mid_day(hour: float) -> float:
+        _, equation = _sun_position(jdate + hour / 24.0)
+        return _fix(12 - equation, 24.0)
+
+    def sun_angle_time(angle: float, hour: float, before_noon: bool = False) -> float:
+        declination, _ = _sun_position(jdate + hour / 24.0)
+        noon = mid_day(hour)
+        t = _arccos(
+            (-_sin(angle) - _sin(declination) * _sin(lat))
+            / (_cos(declination) * _cos(lat))
+        ) / 15.0
+        return noon - t if before_noon else noon + t
+
+    def asr_time(factor: float, hour: float) -> float:
+        declination, _ = _sun_position(jdate + hour / 24.0)
+        angle = -_arccot(factor + _tan(abs(lat - declination)))
+        return sun_angle_time(angle, hour)
+
+    fajr = sun_angle_time(fajr_angle, 5, before_noon=True)
+    sunrise = sun_angle_time(RISE_SET_ANGLE, 6, before_noon=True)
+    dhuhr = mid_day(12)
+    asr = asr_time(1, 13)
+    sunset = sun_angle_time(RISE_SET_ANGLE, 18)
+    isha = sun_angle_time(isha_angle, 18)
+
+    shift = utc_offset - lng / 15.0
+    times = {
+        "Fajr": fajr + shift,
+        "Sunrise": sunrise + shift,
+        "Dhuhr": dhuhr + shift,
+        "Asr": asr + shift,
+        "Sunset": sunset + shift,
+        "Maghrib": sunset + shift,
+        "Isha": isha + shift,
+    }
+    times["Imsak"] = times["Fajr"] - IMSAK_MINUTES_BEFORE_FAJR / 60.0
+    if "Dhuha" in keys:
+        times["Dhuha"] = sun_angle_time(-DHUHA_ALTITUDE, 7, before_noon=True) + shift
+    return {key: times[key] for key in keys}
+
+
+def compute_minutes(
+    date: datetime.date,
+    lat: float,
+    lng: float,
+    tune: str = "",
+    method: int = 20,
+    utc_offset: float | None = None,
+    keys: tuple[str, ...] = TIME_KEYS,
+) -> dict[str, int]:
+    """Compute tuned prayer times as whole minutes after local midnight.
+
+    Rounds to the nearest minute the way Aladhan formats its ``HH:MM``.
+    """
+    if utc_offset is None:
+        utc_offset = utc_offset_for(lat, lng)
+    offsets = parse_tune(tune)
+    hours = compute_times(date, lat, lng, utc_offset, method, keys)
+    return {
+        key: int(math.floor(_fix(value * 60 + offsets.get(key, 0) + 0.5, 1440.0)))
+        for key, value in hours.items()
+    }
+
+
+def format_minutes(minutes: int) -> str:
+    """Format minutes after midnight as ``HH:MM``."""
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
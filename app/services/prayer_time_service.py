@@ -1,9 +1,23 @@
 """Service for fetching prayer times from the Aladhan API."""
 
 import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed, wait
+
 import requests
 
-from app.constants import PRAYER_NAME_MAP, CITY_COORDINATES
+from app.constants import ALERT_NAME_MAP, PRAYER_NAME_MAP, CITY_COORDINATES
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.event_log import event_log
+from app.services.prayer_calculator import (
+    TIME_KEYS,
+    compute_minutes,
+    format_minutes,
+    parse_tune,
+)
+from app.services.schedule_cache import ScheduleCache
+from app.services.schedule_pack import SchedulePack
+from app.services.shared_cache import LockTimeout, SharedScheduleCache
 
 
 class PrayerTimeService:
@@ -13,39 +27,286 @@ class PrayerTimeService:
     METHOD = 20
     TUNE = "0,3,0,4,3,3,0,2,0"
 
+    # Latency budget of one API request (connect, and each read)
+    API_TIMEOUT_S = 4.0
+    # With a mirror configured, it is asked too if the primary hasn't
+    # answered within this delay (or has already failed)
+    HEDGE_DELAY_S = 1.0
+
+    def __init__(
+        self,
+        method: int = METHOD,
+        tune: str = TUNE,
+        shared_cache_dir: str | None = None,
+        mirror_url: str | None = None,
+    ):
+        self.method = method
+        self.tune = tune
+        self._offsets = parse_tune(tune)
+        self.pack = SchedulePack(method)
+        self.cache = ScheduleCache(method, tune)
+        self.cache.load()
+        # fetch() and prefetch() run on worker threads
+        self._cache_lock = threading.Lock()
+        self._shared_dir = shared_cache_dir
+        self.shared = self._open_shared(method)
+        self.mirror_url = mirror_url or None
+        self.breaker = CircuitBreaker()
+        self._requests = ThreadPoolExecutor(max_workers=4, thread_name_prefix="aladhan")
+
     def fetch(self, city: str) -> dict[str, str]:
         """Fetch today's prayer times for the given city using coordinates.
 
-        Uses the Aladhan /timings endpoint with latitude & longitude
-        for accurate results across all Indonesian cities.
+        Aladhan is the source of truth; the offline engine is only a
+        fallback. Tries each source in order and stops at the first that
+        answers:
+
+        1. the in-memory cache of earlier API results;
+        2. the shared cache directory, if configured (only one user on
+           the machine calls the API for a given city-day; the others
+           wait and read its result);
+        3. the Aladhan /timings endpoint with latitude & longitude,
+           within ``API_TIMEOUT_S`` per request, hedged to the mirror if
+           one is set, and skipped while the circuit breaker is open;
+        4. ``compute_local``: the offline schedule pack if one is
+           installed, else local computation with the API's own algorithm
+           (see ``scripts/check_accuracy.py`` for the measured deviation).
+
+        API results are cached untuned, and the tune offsets are applied
+        locally. Because of the last step, a known city always gets a
+        schedule, at worst after about two API timeouts.
 
         Returns:
             A dict mapping prayer names (e.g. "Subuh") to time strings (e.g. "04:35").
+        """
+        today = datetime.date.today()
+        try:
+            return self._fetch_tuned(city, today)
+        except Exception as e:
+            # Whatever failed (network, a malformed reply or a cache
+            # file), the schedule can still be computed offline
+            event_log.warning("schedule_fetch_fallback_local", city, e)
+            return self.compute_local(city, today)
+
+    def _fetch_tuned(self, city: str, today: datetime.date) -> dict[str, str]:
+        """Steps 1-3 of ``fetch``; raises if none of them has the schedule."""
+        with self._cache_lock:
+            cached = self.cache.get(city, today, PRAYER_NAME_MAP.values())
+        if cached is not None:
+            return self._format(cached)
+
+        self._fetch_into_cache(city, today)
+        with self._cache_lock:
+            self.cache.save()
+            return self._format(self.cache.get(city, today, PRAYER_NAME_MAP.values()))
+
+    def prefetch(self, cities: list[str], max_requests: int) -> int:
+        """Warm the cache for today and tomorrow in each city, in order.
+
+        Days already in the cache cost nothing; every other city-day
+        costs one request, and prefetching stops once ``max_requests``
+        have been made. The offline pack doesn't count as cached: it is
+        only ``fetch``'s last resort. Slow; call it off the UI thread.
+
+        Returns:
+            The number of requests made, including ones that failed, so
+            the caller can charge them to its budget.
+        """
+        today = datetime.date.today()
+        used = 0
+        work = [
+            (city, date)
+            for city in cities
+            for date in (today, today + datetime.timedelta(days=1))
+        ]
+        for city, date in work:
+            if used >= max_requests:
+                break
+            try:
+                if self._is_cached(city, date):
+                    continue
+                used += 1
+                self._fetch_into_cache(city, date)
+            except CircuitOpenError:
+                used -= 1  # refused before any request was made
+                break  # the API is down; don't queue more attempts
+            except (requests.RequestException, KeyError, ValueError,
+                    TypeError, OSError) as e:
+                event_log.warning("prefetch_failed", city, date, e)
+        if used:
+            try:
+                with self._cache_lock:
+                    self.cache.save()
+            except OSError as e:
+                event_log.warning("schedule_cache_save_failed", e)
+        return used
+
+    def _is_cached(self, city: str, date: datetime.date) -> bool:
+        with self._cache_lock:
+            return self.cache.get(city, date, PRAYER_NAME_MAP.values()) is not None
+
+    def _fetch_into_cache(self, city: str, date: datetime.date) -> None:
+        """Fetch one city-day (via the shared cache if configured) into the cache."""
+        if self.shared is None:
+            base = self._fetch_api(city, date)
+        else:
+            base = self.shared.get(city, date)
+            if base is None:
+                try:
+                    with self.shared.locked(city):
+                        # Another user may have fetched it while we waited
+                        base = self.shared.get(city, date)
+                        if base is None:
+                            base = self._fetch_api(city, date)
+                            self.shared.put(city, date, base)
+                except LockTimeout as e:
+                    # A peer is stuck holding the lock: skip the shared tier
+                    event_log.warning("shared_cache_lock_timeout", city, e)
+                    base = self._fetch_api(city, date)
+
+        with self._cache_lock:
+            self.cache.put(city, date, base)
+
+    def _fetch_api(self, city: str, date: datetime.date) -> dict[str, int]:
+        """Fetch untuned base minutes for one city-day from Aladhan.
 
         Raises:
-            requests.RequestException: On network errors.
-            KeyError: On unexpected API response structure.
+            CircuitOpenError: If recent requests kept failing.
         """
-        today = datetime.datetime.now().strftime("%d-%m-%Y")
+        if not self.breaker.allow():
+            raise CircuitOpenError("Aladhan API paused after repeated failures")
         lat, lng = CITY_COORDINATES[city]
-        url = f"{self.API_BASE_URL}/timings/{today}"
+        path = f"/timings/{date:%d-%m-%Y}"
         params = {
             "latitude": lat,
             "longitude": lng,
-            "method": self.METHOD,
-            "tune": self.TUNE,
+            "method": self.method,
         }
 
-        resp = requests.get(url, params=params)
+        try:
+            timings = self._get_hedged(path, params)["data"]["timings"]
+            base = {
+                key: self._to_minutes(timings[key])
+                for key in TIME_KEYS if key in timings
+            }
+        except Exception:
+            # Any failure (including a reply that isn't the expected JSON
+            # object) must be recorded, or a half-open trial never ends
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return base
+
+    def _get_json(self, base_url: str, path: str, params: dict) -> dict:
+        resp = requests.get(base_url + path, params=params, timeout=self.API_TIMEOUT_S)
         resp.raise_for_status()
-        timings = resp.json()["data"]["timings"]
+        return resp.json()
 
-        prayer_times = {}
-        for ui_name, api_key in PRAYER_NAME_MAP.items():
-            raw_time = timings[api_key]
-            prayer_times[ui_name] = raw_time.split(" ")[0]
+    def _get_hedged(self, path: str, params: dict) -> dict:
+        """GET ``path`` from the API, racing the mirror if the primary is slow.
 
-        return prayer_times
+        Returns the first successful response; raises the last error if
+        both fail, or ``requests.Timeout`` if neither answers in time.
+        """
+        if self.mirror_url is None:
+            return self._get_json(self.API_BASE_URL, path, params)
+
+        primary = self._requests.submit(self._get_json, self.API_BASE_URL, path, params)
+        done, _ = wait([primary], timeout=self.HEDGE_DELAY_S)
+        if done and primary.exception() is None:
+            return primary.result()
+        mirror = self._requests.submit(self._get_json, self.mirror_url, path, params)
+
+        error: Exception | None = None
+        try:
+            for future in as_completed([primary, mirror], timeout=2 * self.API_TIMEOUT_S):
+                try:
+                    return future.result()
+                except (requests.RequestException, ValueError) as e:
+                    error = e
+        except TimeoutError:
+            raise requests.Timeout(f"no answer from API or mirror for {path}") from None
+        raise error
+
+    def set_tune(self, tune: str) -> None:
+        """Change the per-prayer minute offsets without refetching anything."""
+        self.tune = tune
+        self._offsets = parse_tune(tune)
+        with self._cache_lock:
+            self.cache.set_tune(tune)
+
+    def set_method(self, method: int) -> None:
+        """Change the calculation method, dropping only what depends on it."""
+        self.method = method
+        self.pack = SchedulePack(method)
+        self.shared = self._open_shared(method)
+        with self._cache_lock:
+            self.cache.set_method(method)
+            self.cache.save()
+
+    def _open_shared(self, method: int) -> SharedScheduleCache | None:
+        if not self._shared_dir:
+            return None
+        try:
+            return SharedScheduleCache(self._shared_dir, method)
+        except OSError as e:
+            event_log.warning("shared_cache_unavailable", e)
+            return None
+
+    def compute_local(
+        self, city: str, date: datetime.date | None = None
+    ) -> dict[str, str]:
+        """Compute prayer times for the given city offline.
+
+        Reads the offline schedule pack when one is installed (same
+        engine, precomputed), else computes the day. Uses the same method
+        and tune as ``fetch`` and returns the same shape, without
+        touching the network.
+        """
+        date = date or datetime.date.today()
+        try:
+            base = self.pack.lookup(city, date)
+        except (OSError, ValueError) as e:
+            event_log.warning("schedule_pack_lookup_failed", city, e)
+            base = None
+        if base is not None:
+            minutes = {key: value + self._offsets[key] for key, value in base.items()}
+        else:
+            lat, lng = CITY_COORDINATES[city]
+            minutes = compute_minutes(date, lat, lng, self.tune, self.method)
+        return self._format(minutes)
+
+    def alert_times(
+        self, city: str, date: datetime.date | None = None
+    ) -> dict[str, str]:
+        """Return the day's Imsak and Terbit times for optional alerts.
+
+        Read from the cache the last ``fetch`` filled, or computed locally
+        when it has none; never touches the network.
+        """
+        date = date or datetime.date.today()
+        with self._cache_lock:
+            minutes = self.cache.get(city, date, ALERT_NAME_MAP.values())
+        if minutes is None:
+            lat, lng = CITY_COORDINATES[city]
+            minutes = compute_minutes(date, lat, lng, self.tune, self.method)
+        return {
+            ui_name: format_minutes(minutes[api_key])
+            for ui_name, api_key in ALERT_NAME_MAP.items()
+        }
+
+    @staticmethod
+    def _to_minutes(raw_time: str) -> int:
+        """Convert an API time such as "04:35 (WIB)" to minutes after midnight."""
+        hour, minute = raw_time.split(" ")[0].split(":")
+        return int(hour) * 60 + int(minute)
+
+    @staticmethod
+    def _format(minutes: dict[str, int]) -> dict[str, str]:
+        return {
+            ui_name: format_minutes(minutes[api_key])
+            for ui_name, api_key in PRAYER_NAME_MAP.items()
+        }
 
     @staticmethod
     def today_formatted() -> str:
@@ -0,0 +1,133 @@
+"""Opt-in profiling of startup and the first minutes of steady state.
+
+Requested with ``--profile`` (startup only), ``--profile=N`` (startup,
+then N minutes of steady state) or the same values in
+``ADZANID_PROFILE``. Startup runs under ``cProfile`` and is written as
+``startup-<version>-<timestamp>.pstats`` plus a readable ``.txt``
+summary. Steady state is sampled instead, because the app then mostly
+sleeps in the event loop: a background thread records the main thread's
+stack every ``INTERVAL_S`` and writes ``steady-<version>-<timestamp>.collapsed``
+in the folded format flame graph tools read. Everything goes to
+``profiles/`` in the user data directory; only the standard library is
+used, so users need nothing installed.
+"""
+
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import sys
+import threading
+
+from app.constants import APP_VERSION
+from app.services.storage import user_data_dir
+
+ENV_VAR = "ADZANID_PROFILE"
+FLAG = "--profile"
+
+
+def requested(argv: list[str], environ=os.environ) -> int | None:
+    """Return the steady-state minutes requested (0 = startup only), or None."""
+    value = None
+    for arg in argv:
+        if arg == FLAG:
+            value = "0"
+        elif arg.startswith(FLAG + "="):
+            value = arg.split("=", 1)[1]
+    if value is None:
+        value = environ.get(ENV_VAR, "")
+        if value in ("", "0"):
+            return None
+        if value.lower() in ("1", "startup", "true"):
+            value = "0"
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return 0
+
+
+def profile_dir() -> str:
+    path = os.path.join(user_data_dir(), "profiles")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _path(kind: str, ext: str) -> str:
+    stamp = f"{datetime.datetime.now():%Y%m%d-%H%M%S}"
+    return os.path.join(profile_dir(), f"{kind}-{APP_VERSION}-{stamp}.{ext}")
+
+
+class StartupProfiler:
+    """``cProfile`` around a block of code, saved as pstats and text."""
+
+    TOP_N = 40
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> str:
+        """Stop profiling and return the path of the ``.pstats`` file."""
+        self._profile.disable()
+        path = _path("startup", "pstats")
+        self._profile.dump_stats(path)
+
+        summary = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=summary)
+        stats.sort_stats("cumulative").print_stats(self.TOP_N)
+        with open(os.path.splitext(path)[0] + ".txt", "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+        return path
+
+
+class SamplingProfiler:
+    """Samples one thread's stack on a background thread.
+
+    Each sample is folded into "module:function;...;module:function"
+    (outermost first) and counted, so memory stays proportional to the
+    number of distinct stacks, not to the run time.
+    """
+
+    INTERVAL_S = 0.01
+
+    def __init__(self, thread_id: int | None = None, interval_s: float = INTERVAL_S):
+        self._thread_id = thread_id or threading.main_thread().ident
+        self._interval_s = interval_s
+        self._counts: dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def stop(self) -> str:
+        """Stop sampling and return the path of the ``.collapsed`` file."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        path = _path("steady", "collapsed")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self._counts.items(), key=lambda kv: -kv[1]):
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_s):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            stack = ";".join(reversed(names))
+            self._counts[stack] = self._counts.get(stack, 0) + 1
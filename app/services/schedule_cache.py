@@ -0,0 +1,181 @@
+"""Cache of untuned prayer times with in-place re-tuning.
+
+Rows are stored as the untuned base minutes returned by the API (or the
+local engine), with a tuned copy kept alongside. Changing the tune string
+shifts each tuned column by the difference in offsets across every cached
+city and day in one pass; nothing is refetched. Changing the calculation
+method only drops the columns that depend on it (the twilight-angle
+times), leaving Dhuhr, Asr, sunrise and sunset intact.
+"""
+
+import datetime
+import json
+import os
+from array import array
+
+from app.services.prayer_calculator import TIME_KEYS, parse_tune
+from app.services.storage import atomic_write, user_data_dir
+
+# Columns whose value changes with the method's twilight angles
+METHOD_DEPENDENT_KEYS = ("Imsak", "Fajr", "Isha")
+
+_MISSING = -1
+_N = len(TIME_KEYS)
+
+
+class ScheduleCache:
+    """Per-city rows of base and tuned minutes, persisted as JSON."""
+
+    FILENAME = "schedule_cache.json"
+
+    def __init__(self, method: int, tune: str, path: str | None = None):
+        self._method = method
+        self._offsets = parse_tune(tune)
+        self._path = path
+        self._rows: dict[str, dict[datetime.date, int]] = {}
+        self._base: dict[str, array] = {}
+        self._tuned: dict[str, array] = {}
+        self._dirty = False
+        # Past days are dropped on load and on the first save of each day
+        self._pruned_on: datetime.date | None = None
+
+    @property
+    def path(self) -> str:
+        return self._path or os.path.join(user_data_dir(), self.FILENAME)
+
+    def get(
+        self, city: str, date: datetime.date, keys=TIME_KEYS
+    ) -> dict[str, int] | None:
+        """Return tuned minutes for ``keys``, or None if any is not cached."""
+        row = self._rows.get(city, {}).get(date)
+        if row is None:
+            return None
+        base, tuned = self._base[city], self._tuned[city]
+        start = row * _N
+        result = {}
+        for key in keys:
+            col = TIME_KEYS.index(key)
+            if base[start + col] == _MISSING:
+                return None
+            result[key] = tuned[start + col] % 1440
+        return result
+
+    def put(self, city: str, date: datetime.date, base_minutes: dict[str, int]):
+        """Store one day's untuned minutes (keys missing from the dict stay unset)."""
+        rows = self._rows.setdefault(city, {})
+        base = self._base.setdefault(city, array("h"))
+        tuned = self._tuned.setdefault(city, array("h"))
+
+        if date not in rows:
+            rows[date] = len(base) // _N
+            base.extend([_MISSING] * _N)
+            tuned.extend([_MISSING] * _N)
+        start = rows[date] * _N
+
+        for col, key in enumerate(TIME_KEYS):
+            if key in base_minutes:
+                base[start + col] = base_minutes[key]
+                tuned[start + col] = base_minutes[key] + self._offsets[key]
+        self._dirty = True
+
+    def set_tune(self, tune: str):
+        """Re-tune every cached row by the change in per-column offsets."""
+        new_offsets = parse_tune(tune)
+        for col, key in enumerate(TIME_KEYS):
+            delta = new_offsets[key] - self._offsets[key]
+            if not delta:
+                continue
+            for tuned in self._tuned.values():
+                tuned[col::_N] = array("h", [v + delta for v in tuned[col::_N]])
+        self._offsets = new_offsets
+
+    def set_method(self, method: int):
+        """Invalidate only the method-dependent columns of every row."""
+        if method == self._method:
+            return
+        self._method = method
+        for city, base in self._base.items():
+            missing = array("h", [_MISSING]) * (len(base) // _N)
+            for key in METHOD_DEPENDENT_KEYS:
+                col = TIME_KEYS.index(key)
+                base[col::_N] = missing
+                self._tuned[city][col::_N] = missing
+        self._dirty = True
+
+    def prune(self, before: datetime.date):
+        """Forget rows older than ``before``."""
+        for city in list(self._rows):
+            keep = {d: r for d, r in self._rows[city].items() if d >= before}
+            if len(keep) == len(self._rows[city]):
+                continue
+            rows = [self._row_base(city, r) for r in keep.values()]
+            self._drop(city)
+            for date, base_row in zip(keep, rows):
+                self.put(city, date, base_row)
+            self._dirty = True
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> None:
+        """Read the cache file, ignoring it if missing or unreadable."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("columns") != list(TIME_KEYS):
+            return
+
+        stored_method = data.get("method")
+        today = datetime.date.today()
+        stale = False
+        for city, days in data.get("rows", {}).items():
+            for iso_date, values in days.items():
+                date = datetime.date.fromisoformat(iso_date)
+                if date < today:
+                    stale = True
+                    continue
+                row = dict(zip(TIME_KEYS, values))
+                if stored_method != self._method:
+                    for key in METHOD_DEPENDENT_KEYS:
+                        row[key] = _MISSING
+                self.put(city, date, {k: v for k, v in row.items() if v != _MISSING})
+        self._dirty = stale  # rewrite without the past days on the next save
+        self._pruned_on = today
+
+    def save(self) -> None:
+        """Write the cache file atomically if anything changed.
+
+        Days before today are dropped first, so the file stays at the
+        days still ahead however long the app runs.
+        """
+        today = datetime.date.today()
+        if self._pruned_on != today:
+            self.prune(today)
+            self._pruned_on = today
+        if not self._dirty:
+            return
+        data = {
+            "method": self._method,
+            "columns": list(TIME_KEYS),
+            "rows": {
+                city: {
+                    date.isoformat(): list(self._base[city][r * _N:(r + 1) * _N])
+                    for date, r in rows.items()
+                }
+                for city, rows in self._rows.items()
+            },
+        }
+        atomic_write(self.path, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        self._dirty = False
+
+    def _row_base(self, city: str, row: int) -> dict[str, int]:
+        values = self._base[city][row * _N:(row + 1) * _N]
+        return {k: v for k, v in zip(TIME_KEYS, values) if v != _MISSING}
+
+    def _drop(self, city: str):
+        self._rows.pop(city, None)
+        self._base.pop(city, None)
+        self._tuned.pop(city, None)
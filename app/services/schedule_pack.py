@@ -0,0 +1,247 @@
+"""Offline schedule pack: a year of prayer times for every built-in city.
+
+The pack is a ``schedule_table`` file holding one entry per city in
+CITY_COORDINATES. A copy in the user data directory (generated locally,
+or patched by a delta) wins over one bundled in ``assets``; when neither
+exists it is built from the local engine. Corrections are published as small delta files that patch
+individual (city, day, column) values instead of replacing the pack.
+
+Delta file layout (little-endian):
+
+    header   magic "ADZD", format version, year, base revision,
+             new revision, record count
+    records  city name (u8 length + UTF-8), day of year, column index,
+             new value in minutes after midnight
+"""
+
+import datetime
+import hashlib
+import os
+import struct
+import threading
+
+from app.constants import CITY_COORDINATES
+from app.services.event_log import event_log
+from app.services.schedule_table import (
+    ScheduleTable,
+    build_entry,
+    encode_entry,
+    read_entries,
+    write_table,
+)
+from app.services.storage import atomic_write, user_data_dir
+
+DELTA_MAGIC = b"ADZD"
+DELTA_VERSION = 1
+
+_DELTA_HEADER = struct.Struct("<4sHHIII")
+_DELTA_RECORD = struct.Struct("<HBH")
+
+BUNDLED_PACK_DIR = "assets"
+
+
+def pack_filename(year: int) -> str:
+    return f"schedule_pack_{year}.adzt"
+
+
+def build_pack(path: str, year: int, method: int) -> None:
+    """Compute a year of untuned times for every built-in city.
+
+    Tune offsets are applied at read time, so changing them never
+    requires rebuilding the pack.
+    """
+    entries = [
+        build_entry(city, lat, lng, year, method, "")
+        for city, (lat, lng) in sorted(CITY_COORDINATES.items())
+    ]
+    write_table(path, entries, method, "")
+
+
+def encode_delta(
+    year: int,
+    base_revision: int,
+    new_revision: int,
+    changes: list[tuple[str, int, int, int]],
+) -> bytes:
+    """Encode (city, day_of_year, column_index, minutes) changes."""
+    parts = [_DELTA_HEADER.pack(DELTA_MAGIC, DELTA_VERSION, year,
+                                base_revision, new_revision, len(changes))]
+    for city, yday, column, minutes in changes:
+        name = city.encode("utf-8")
+        parts.append(struct.pack("<B", len(name)) + name)
+        parts.append(_DELTA_RECORD.pack(yday, column, minutes))
+    return b"".join(parts)
+
+
+def diff_packs(old_path: str, new_path: str) -> list[tuple[str, int, int, int]]:
+    """List every value that differs between two packs of the same year."""
+    old = {entry.name: entry for entry in read_entries(old_path)}
+    changes = []
+    for entry in read_entries(new_path):
+        new_rows = _decode_rows(entry)
+        old_rows = _decode_rows(old[entry.name]) if entry.name in old else None
+        for yday, row in enumerate(new_rows, start=1):
+            for column, minutes in enumerate(row):
+                if old_rows is None or old_rows[yday - 1][column] != minutes:
+                    changes.append((entry.name, yday, column, minutes))
+    return changes
+
+
+def _decode_rows(entry) -> list[list[int]]:
+    n_columns = len(entry.base)
+    fmt = f"<{entry.days * n_columns}{'B' if entry.width == 1 else 'H'}"
+    flat = struct.unpack(fmt, entry.values)
+    return [
+        [low + flat[day * n_columns + i] for i, low in enumerate(entry.base)]
+        for day in range(entry.days)
+    ]
+
+
+class SchedulePack:
+    """Reads, builds and delta-updates the offline schedule pack."""
+
+    def __init__(self, method: int, data_dir: str | None = None):
+        self._method = method
+        self._data_dir = data_dir
+        self._tables: dict[int, ScheduleTable] = {}
+        # Lookups run on fetch threads while ensure/apply_delta may replace
+        # a table on another; a mapping is only closed while holding this
+        self._lock = threading.RLock()
+
+    def path(self, year: int) -> str:
+        """Return the pack path for ``year``.
+
+        A local (delta-patched) copy wins over the bundled one; if neither
+        exists, this is where ``ensure`` will build it.
+        """
+        local = self._local_path(year)
+        bundled = os.path.join(BUNDLED_PACK_DIR, pack_filename(year))
+        if not os.path.exists(local) and os.path.exists(bundled):
+            return bundled
+        return local
+
+    def lookup(self, city: str, date: datetime.date) -> dict[str, int] | None:
+        """Return the day's untuned minutes, or None if the pack can't answer."""
+        with self._lock:
+            table = self._table(date.year)
+            if table is None or (city, date.year) not in table:
+                return None
+            return table.minutes(city, date)
+
+    def ensure(self, year: int) -> str:
+        """Build the pack for ``year`` locally if missing or for another method.
+
+        Takes seconds of pure-Python CPU; meant for build scripts and
+        delta application, not for the GUI process.
+        """
+        path = self.path(year)
+        with self._lock:
+            usable = os.path.exists(path) and self._table(year) is not None
+        if not usable:
+            # Slow; no table for this year is open meanwhile, and the file
+            # is replaced atomically
+            path = self._local_path(year)
+            build_pack(path, year, self._method)
+            with self._lock:
+                self._close(year)
+        return path
+
+    def revision(self, year: int) -> int:
+        try:
+            with open(f"{self.path(year)}.rev") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def apply_delta(self, year: int, delta: bytes, sha256: str) -> None:
+        """Patch the local pack with a delta file.
+
+        ``sha256`` is the delta's published checksum (printed by
+        ``scripts/build_schedule_pack.py``); nothing is parsed unless the
+        bytes match it.
+
+        Raises:
+            ValueError: If the checksum doesn't match, or the delta is
+                malformed or for another revision.
+        """
+        if hashlib.sha256(delta).hexdigest() != sha256.lower():
+            raise ValueError("Schedule pack delta checksum mismatch")
+        try:
+            magic, version, delta_year, base_rev, new_rev, count = (
+                _DELTA_HEADER.unpack_from(delta, 0)
+            )
+        except struct.error as e:
+            raise ValueError(f"Truncated schedule pack delta: {e}") from None
+        if magic != DELTA_MAGIC or version != DELTA_VERSION or delta_year != year:
+            raise ValueError("Not a schedule pack delta for this year")
+        if base_rev != self.revision(year):
+            raise ValueError(
+                f"Delta expects revision {base_rev}, have {self.revision(year)}"
+            )
+
+        path = self.ensure(year)
+        entries = {entry.name: entry for entry in read_entries(path)}
+        rows_by_city: dict[str, list[list[int]]] = {}
+
+        pos = _DELTA_HEADER.size
+        try:
+            for _ in range(count):
+                name_len = delta[pos]
+                city = delta[pos + 1:pos + 1 + name_len].decode("utf-8")
+                pos += 1 + name_len
+                yday, column, minutes = _DELTA_RECORD.unpack_from(delta, pos)
+                pos += _DELTA_RECORD.size
+                if city not in rows_by_city:
+                    rows_by_city[city] = _decode_rows(entries[city])
+                rows = rows_by_city[city]
+                if not 1 <= yday <= len(rows):
+                    raise IndexError(f"day {yday} out of range")
+                rows[yday - 1][column] = minutes
+        except (IndexError, KeyError, struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"Malformed schedule pack delta: {e!r}") from None
+
+        for city, rows in rows_by_city.items():
+            old = entries[city]
+            entries[city] = encode_entry(city, old.lat, old.lng,
+                                         old.utc_offset_min, year, rows)
+
+        # Deltas always land in the writable copy, never in bundled assets.
+        # The old mapping must be closed first (Windows can't replace a
+        # mapped file); holding the lock makes lookups wait for the new one.
+        local_path = self._local_path(year)
+        with self._lock:
+            self._close(year)
+            write_table(local_path, list(entries.values()), self._method, "")
+            atomic_write(f"{local_path}.rev", str(new_rev).encode("ascii"))
+
+    def _local_path(self, year: int) -> str:
+        return os.path.join(self._data_dir or user_data_dir(), pack_filename(year))
+
+    def _table(self, year: int) -> ScheduleTable | None:
+        if year not in self._tables:
+            path = self.path(year)
+            if not os.path.exists(path):
+                return None
+            try:
+                table = ScheduleTable(path)
+            except (OSError, ValueError, struct.error) as e:
+                # Truncated or corrupt: drop a local copy so the bundled
+                # pack (or local computation) answers from now on
+                event_log.warning("schedule_pack_invalid", path, e)
+                if path == self._local_path(year):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                return None
+            if table.method != self._method or table.tune:
+                table.close()
+                return None
+            self._tables[year] = table
+        return self._tables[year]
+
+    def _close(self, year: int):
+        table = self._tables.pop(year, None)
+        if table is not None:
+            table.close()
+
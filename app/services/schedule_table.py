@@ -0,0 +1,217 @@
+"""Compact binary prayer time tables with O(1) lookup by (location, day).
+
+File layout (all little-endian):
+
+    header   magic "ADZT", format version, method, column count, entry count,
+             tune string
+    columns  one 8-byte ASCII name per time column (see TIME_KEYS)
+    index    one fixed-size record per (location, year): name, coordinates,
+             UTC offset, per-column base minute, value width, data offset
+    data     per entry, ``days x columns`` offsets from the base minute,
+             1 byte each (2 bytes when a column spans more than 255 minutes)
+
+Storing each value as an offset from the entry's yearly minimum keeps a
+location-year at ~3 KB while every day stays at a fixed, seekable position.
+"""
+
+import datetime
+import mmap
+import os
+import struct
+from array import array
+from dataclasses import dataclass
+
+from app.services.prayer_calculator import TIME_KEYS, compute_minutes, utc_offset_for
+
+MAGIC = b"ADZT"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHBBI64s")
+_COLUMN = struct.Struct("<8s")
+_INDEX = struct.Struct(f"<48sddhBxHH{len(TIME_KEYS)}HQ")
+NAME_BYTES = 48
+
+
+def stored_name(name: str) -> str:
+    """Return ``name`` as the index stores it: at most 48 UTF-8 bytes,
+    cut on a character boundary."""
+    return name.encode("utf-8")[:NAME_BYTES].decode("utf-8", errors="ignore")
+
+
+@dataclass
+class TableEntry:
+    """One location-year of prayer times."""
+
+    name: str
+    lat: float
+    lng: float
+    utc_offset_min: int
+    year: int
+    base: tuple[int, ...]
+    width: int
+    values: bytes
+
+    @property
+    def days(self) -> int:
+        return len(self.values) // (self.width * len(self.base))
+
+
+def build_entry(
+    name: str,
+    lat: float,
+    lng: float,
+    year: int,
+    method: int,
+    tune: str,
+    utc_offset: float | None = None,
+) -> TableEntry:
+    """Compute a full year for one location with the local engine."""
+    if utc_offset is None:
+        utc_offset = utc_offset_for(lat, lng)
+
+    day = datetime.date(year, 1, 1)
+    rows = []
+    while day.year == year:
+        minutes = compute_minutes(day, lat, lng, tune, method, utc_offset)
+        rows.append([minutes[key] for key in TIME_KEYS])
+        day += datetime.timedelta(days=1)
+
+    return encode_entry(name, lat, lng, round(utc_offset * 60), year, rows)
+
+
+def encode_entry(
+    name: str,
+    lat: float,
+    lng: float,
+    utc_offset_min: int,
+    year: int,
+    rows: list[list[int]],
+) -> TableEntry:
+    """Delta-encode per-day minute rows against each column's minimum."""
+    base = tuple(min(column) for column in zip(*rows))
+    span = max(max(column) - low for column, low in zip(zip(*rows), base))
+    width = 1 if span <= 0xFF else 2
+    values = array("B" if width == 1 else "H")
+    for row in rows:
+        values.extend(minute - low for minute, low in zip(row, base))
+    return TableEntry(name, lat, lng, utc_offset_min, year, base, width,
+                      values.tobytes())
+
+
+def write_table(path: str, entries: list[TableEntry], method: int, tune: str):
+    """Write entries to ``path`` atomically (temp file, then rename).
+
+    Raises:
+        ValueError: If two entries share a (stored name, year); the
+            reader could only ever return one of them.
+    """
+    seen = set()
+    for entry in entries:
+        key = (stored_name(entry.name), entry.year)
+        if key in seen:
+            raise ValueError(f"duplicate location-year in table: {key[0]} {key[1]}")
+        seen.add(key)
+
+    data_start = (
+        _HEADER.size
+        + _COLUMN.size * len(TIME_KEYS)
+        + _INDEX.size * len(entries)
+    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, method, len(TIME_KEYS),
+                             len(entries), tune.encode("ascii")))
+        for key in TIME_KEYS:
+            f.write(_COLUMN.pack(key.encode("ascii")))
+
+        offset = data_start
+        for entry in entries:
+            f.write(_INDEX.pack(
+                stored_name(entry.name).encode("utf-8"), entry.lat, entry.lng,
+                entry.utc_offset_min, entry.width, entry.year, entry.days,
+                *entry.base, offset,
+            ))
+            offset += len(entry.values)
+
+        for entry in entries:
+            f.write(entry.values)
+    os.replace(tmp_path, path)
+
+
+class ScheduleTable:
+    """Memory-mapped reader for a table file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.method, n_columns, n_entries, tune = (
+            _HEADER.unpack_from(self._buf, 0)
+        )
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a schedule table")
+        self.tune = tune.rstrip(b"\0").decode("ascii")
+
+        pos = _HEADER.size
+        self.columns = tuple(
+            _COLUMN.unpack_from(self._buf, pos + i * _COLUMN.size)[0]
+            .rstrip(b"\0").decode("ascii")
+            for i in range(n_columns)
+        )
+        pos += _COLUMN.size * n_columns
+
+        self._index: dict[tuple[str, int], tuple] = {}
+        for i in range(n_entries):
+            record = _INDEX.unpack_from(self._buf, pos + i * _INDEX.size)
+            name = record[0].rstrip(b"\0").decode("utf-8", errors="ignore")
+            if (name, record[5]) in self._index:
+                raise ValueError(f"{path} has duplicate entries for {name} {record[5]}")
+            self._index[(name, record[5])] = record
+
+    def __contains__(self, key: tuple[str, int]) -> bool:
+        name, year = key
+        return (stored_name(name), year) in self._index
+
+    def keys(self):
+        """Return the (name, year) pairs stored in the table."""
+        return self._index.keys()
+
+    def entry(self, name: str, year: int) -> TableEntry:
+        """Return a whole location-year."""
+        record = self._index[(stored_name(name), year)]
+        width, days, offset = record[4], record[6], record[-1]
+        size = days * len(self.columns) * width
+        return TableEntry(
+            name, record[1], record[2], record[3], year,
+            tuple(record[7:-1]), width, self._buf[offset:offset + size],
+        )
+
+    def minutes(self, name: str, date: datetime.date) -> dict[str, int]:
+        """Return one day's times as minutes after local midnight.
+
+        Raises:
+            KeyError: If the location-year is not in the table.
+        """
+        record = self._index[(stored_name(name), date.year)]
+        width, base, offset = record[4], record[7:-1], record[-1]
+        n_columns = len(self.columns)
+        start = offset + (date.timetuple().tm_yday - 1) * n_columns * width
+        fmt = f"<{n_columns}{'B' if width == 1 else 'H'}"
+        deltas = struct.unpack_from(fmt, self._buf, start)
+        return {
+            key: low + delta
+            for key, low, delta in zip(self.columns, base, deltas)
+        }
+
+    def close(self):
+        self._buf.close()
+
+
+def read_entries(path: str) -> list[TableEntry]:
+    """Load every entry of a table file (used when merging shards)."""
+    table = ScheduleTable(path)
+    try:
+        return [table.entry(name, year) for name, year in table.keys()]
+    finally:
+        table.close()
@@ -0,0 +1,377 @@
+"""Time-ordered scheduling of prayer events with clock-jump recovery."""
+
+import datetime
+import heapq
+import itertools
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from app.services.clock import SystemClock
+from app.services.event_log import event_log
+
+# Event kinds: the adhan itself, a reminder ``lead`` minutes before it,
+# and notification-only alerts such as Imsak and Terbit
+ADHAN, REMINDER, ALERT = "adhan", "reminder", "alert"
+
+
+@dataclass(order=True)
+class ScheduledEvent:
+    """A single pending event, ordered by its wall-clock deadline."""
+
+    when: datetime.datetime
+    seq: int
+    name: str = field(compare=False)
+    city: str = field(default="", compare=False)
+    kind: str = field(default=ADHAN, compare=False)
+    lead: int = field(default=0, compare=False)  # minutes before the prayer
+    cancelled: bool = field(default=False, compare=False)
+
+
+@dataclass
+class PollResult:
+    """Outcome of a scheduler wake-up."""
+
+    due: list[ScheduledEvent]
+    missed: list[ScheduledEvent]
+    day_changed: bool
+    clock_jumped: bool
+
+
+class PrayerScheduler:
+    """Keeps today's prayer deadlines in a heap and reports which are due.
+
+    Any number of cities can be loaded; their events share one heap, so a
+    wake-up costs O(log n) per due event however many cities are watched.
+    Reminders and alerts are events in the same heap. A single event is
+    added with a heap push and cancelled by marking it, so both are
+    O(log n); marked events are skipped when they reach the top.
+
+    The scheduler never polls on its own. The caller arms a single timer
+    for ``seconds_until_next()`` and calls ``poll()`` when it fires. Each
+    poll compares how far the wall clock moved against the monotonic
+    clock, so a suspend/resume or an NTP step is noticed on the first
+    wake-up after it happens.
+    """
+
+    # Wall clock may drift from the monotonic clock by this much between
+    # two wake-ups before it is treated as a jump.
+    JUMP_TOLERANCE_S = 5.0
+
+    # Events overdue by at most this many minutes still fire (e.g. the
+    # machine resumed shortly after the prayer time); older ones are logged.
+    MISSED_GRACE_MIN = 10
+
+    # Upper bound on a single sleep, so jumps are noticed even when the
+    # next prayer is hours away.
+    MAX_SLEEP_S = 30.0
+
+    def __init__(
+        self,
+        missed_grace_minutes: int = MISSED_GRACE_MIN,
+        max_sleep_s: float = MAX_SLEEP_S,
+    ):
+        self._grace = datetime.timedelta(minutes=missed_grace_minutes)
+        self._max_sleep_s = max_sleep_s
+        self._queue: list[ScheduledEvent] = []
+        # (city, kind, name) → its pending event, for single-event changes
+        self._index: dict[tuple[str, str, str], ScheduledEvent] = {}
+        self._cancelled = 0
+        self._seq = itertools.count()
+        self._date: datetime.date | None = None
+        self._last_wall: datetime.datetime | None = None
+        self._last_mono: float | None = None
+
+    @property
+    def date(self) -> datetime.date | None:
+        """Return the day the current schedule belongs to."""
+        return self._date
+
+    def set_schedule(
+        self,
+        date: datetime.date,
+        prayer_times: dict[str, str],
+        now: datetime.datetime,
+        catch_up: bool = False,
+        city: str = "",
+        shift_minutes: int = 0,
+        reminders: dict[str, int] | None = None,
+        alerts: dict[str, str] | None = None,
+    ):
+        """Replace ``city``'s pending events with the given day's prayer times.
+
+        Events of other cities are kept. ``shift_minutes`` converts the
+        city's local times to this machine's clock (e.g. -60 for a WITA
+        city watched from a WIB machine). ``reminders`` maps a prayer to
+        minutes of warning (0 = none); ``alerts`` maps extra names such
+        as "Imsak" to their times.
+
+        Prayers that started before the current minute are dropped, so
+        loading a schedule mid-day never replays earlier adhans. With
+        ``catch_up`` (a day rollover noticed late, e.g. after resuming)
+        they are kept so the next poll applies the missed-event policy.
+        """
+        start_of_minute = now.replace(second=0, microsecond=0)
+        self._queue = [e for e in self._queue if e.city != city and not e.cancelled]
+        self._cancelled = 0
+        self._index = {key: e for key, e in self._index.items() if e.city != city}
+        self._date = date
+
+        planned = []
+        for name, time_str in prayer_times.items():
+            when = self._at(date, time_str, shift_minutes)
+            planned.append((when, name, ADHAN, 0))
+            lead = (reminders or {}).get(name, 0)
+            if lead > 0:
+                planned.append((when - datetime.timedelta(minutes=lead), name, REMINDER, lead))
+        for name, time_str in (alerts or {}).items():
+            planned.append((self._at(date, time_str, shift_minutes), name, ALERT, 0))
+
+        for when, name, kind, lead in planned:
+            if catch_up or when >= start_of_minute:
+                event = ScheduledEvent(when, next(self._seq), name, city, kind, lead)
+                self._queue.append(event)
+                self._index[(city, kind, name)] = event
+        heapq.heapify(self._queue)
+
+    def add(
+        self,
+        when: datetime.datetime,
+        name: str,
+        city: str = "",
+        kind: str = ADHAN,
+        lead: int = 0,
+    ) -> ScheduledEvent:
+        """Schedule one event, replacing any pending one with the same key."""
+        self.cancel(city, kind, name)
+        event = ScheduledEvent(when, next(self._seq), name, city, kind, lead)
+        heapq.heappush(self._queue, event)
+        self._index[(city, kind, name)] = event
+        return event
+
+    def cancel(self, city: str, kind: str, name: str) -> bool:
+        """Cancel the pending event with this key; return False if there is none."""
+        event = self._index.pop((city, kind, name), None)
+        if event is None:
+            return False
+        event.cancelled = True
+        self._cancelled += 1
+        # Rebuild once marked events dominate, keeping pops cheap
+        if self._cancelled > len(self._queue) // 2:
+            self._queue = [e for e in self._queue if not e.cancelled]
+            heapq.heapify(self._queue)
+            self._cancelled = 0
+        return True
+
+    def find(self, city: str, kind: str, name: str) -> ScheduledEvent | None:
+        """Return the pending event with this key, if any."""
+        return self._index.get((city, kind, name))
+
+    def set_reminder(
+        self, prayer: str, minutes: int, now: datetime.datetime, city: str = ""
+    ) -> bool:
+        """Move (or drop, with 0) the reminder before today's ``prayer``.
+
+        Returns:
+            True if a reminder is now pending.
+        """
+        self.cancel(city, REMINDER, prayer)
+        adhan = self.find(city, ADHAN, prayer)
+        if adhan is None or minutes <= 0:
+            return False
+        when = adhan.when - datetime.timedelta(minutes=minutes)
+        if when < now.replace(second=0, microsecond=0):
+            return False
+        self.add(when, prayer, city, REMINDER, minutes)
+        return True
+
+    def set_alert(
+        self, name: str, time_str: str | None, now: datetime.datetime, city: str = ""
+    ) -> bool:
+        """Schedule (or with None, cancel) the alert ``name`` on the current day.
+
+        Returns:
+            True if the alert is now pending.
+        """
+        self.cancel(city, ALERT, name)
+        if not time_str or self._date is None:
+            return False
+        when = self._at(self._date, time_str, 0)
+        if when < now.replace(second=0, microsecond=0):
+            return False
+        self.add(when, name, city, ALERT)
+        return True
+
+    def remove(self, city: str):
+        """Drop every pending event of ``city``."""
+        self._queue = [e for e in self._queue if e.city != city and not e.cancelled]
+        self._cancelled = 0
+        self._index = {key: e for key, e in self._index.items() if e.city != city}
+        heapq.heapify(self._queue)
+
+    def poll(self, now: datetime.datetime, monotonic: float) -> PollResult:
+        """Pop every event whose deadline has passed.
+
+        Events late by no more than the grace period are returned in
+        ``due``; anything older is returned in ``missed``.
+        """
+        clock_jumped = self._detect_jump(now, monotonic)
+
+        due: list[ScheduledEvent] = []
+        missed: list[ScheduledEvent] = []
+        while self._queue and self._queue[0].when <= now:
+            event = heapq.heappop(self._queue)
+            if event.cancelled:
+                self._cancelled -= 1
+                continue
+            self._index.pop((event.city, event.kind, event.name), None)
+            if now - event.when <= self._grace:
+                due.append(event)
+            else:
+                missed.append(event)
+
+        day_changed = self._date is not None and now.date() != self._date
+        return PollResult(due, missed, day_changed, clock_jumped)
+
+    def upcoming(self, count: int, kind: str | None = ADHAN) -> list[ScheduledEvent]:
+        """Return the next ``count`` pending events of ``kind`` (None = any), soonest first."""
+        return heapq.nsmallest(count, (
+            e for e in self._queue
+            if not e.cancelled and (kind is None or e.kind == kind)
+        ))
+
+    def seconds_until_next(self, now: datetime.datetime) -> float:
+        """Return how long the caller may sleep before the next poll.
+
+        Never sleeps past the next event, local midnight, or the cap.
+        """
+        midnight = datetime.datetime.combine(
+            now.date() + datetime.timedelta(days=1), datetime.time()
+        )
+        delta = (midnight - now).total_seconds()
+        while self._queue and self._queue[0].cancelled:
+            heapq.heappop(self._queue)
+            self._cancelled -= 1
+        if self._queue:
+            delta = min(delta, (self._queue[0].when - now).total_seconds())
+        return max(0.0, min(delta, self._max_sleep_s))
+
+    @staticmethod
+    def _at(date: datetime.date, time_str: str, shift_minutes: int) -> datetime.datetime:
+        hour, minute = (int(part) for part in time_str.split(":"))
+        return (datetime.datetime.combine(date, datetime.time(hour, minute))
+                + datetime.timedelta(minutes=shift_minutes))
+
+    def _detect_jump(self, now: datetime.datetime, monotonic: float) -> bool:
+        jumped = False
+        if self._last_wall is not None and self._last_mono is not None:
+            wall_elapsed = (now - self._last_wall).total_seconds()
+            mono_elapsed = monotonic - self._last_mono
+            jumped = abs(wall_elapsed - mono_elapsed) > self.JUMP_TOLERANCE_S
+        self._last_wall = now
+        self._last_mono = monotonic
+        return jumped
+
+
+class AdhanController:
+    """Runs the scheduler against a clock and dispatches adhan triggers.
+
+    Holds the tick/trigger logic that used to live in ``MainWindow`` with
+    every side effect injected, so the same code drives the real window
+    and the time-warp simulation in ``scripts/simulate_schedule.py``.
+    """
+
+    def __init__(
+        self,
+        notify: Callable[[str, str], None],
+        play: Callable[[str, str], bool],
+        is_dnd: Callable[[], bool],
+        clock=None,
+        scheduler: PrayerScheduler | None = None,
+        on_triggered: Callable[[str, str, bool], None] | None = None,
+        remind: Callable[[ScheduledEvent], None] | None = None,
+    ):
+        self._notify = notify
+        self._play = play
+        self._is_dnd = is_dnd
+        self._on_triggered = on_triggered
+        self._remind = remind
+        self.clock = clock or SystemClock()
+        self.scheduler = scheduler or PrayerScheduler()
+
+    def load(
+        self,
+        prayer_times: dict[str, str],
+        catch_up: bool = False,
+        city: str = "",
+        shift_minutes: int = 0,
+        reminders: dict[str, int] | None = None,
+        alerts: dict[str, str] | None = None,
+    ) -> float:
+        """Install today's schedule for ``city`` and return seconds until the next wake."""
+        now = self.clock.now()
+        self.scheduler.set_schedule(
+            now.date(), prayer_times, now, catch_up, city, shift_minutes, reminders, alerts
+        )
+        return self.scheduler.seconds_until_next(now)
+
+    def set_reminder(self, prayer: str, minutes: int, city: str = "") -> float:
+        """Change one prayer's reminder and return seconds until the next wake."""
+        now = self.clock.now()
+        self.scheduler.set_reminder(prayer, minutes, now, city)
+        return self.scheduler.seconds_until_next(now)
+
+    def set_alert(self, name: str, time_str: str | None, city: str = "") -> float:
+        """Schedule (or with None, cancel) today's alert ``name``."""
+        now = self.clock.now()
+        self.scheduler.set_alert(name, time_str, now, city)
+        return self.scheduler.seconds_until_next(now)
+
+    def unload(self, city: str) -> float:
+        """Stop watching ``city`` and return seconds until the next wake."""
+        self.scheduler.remove(city)
+        return self.scheduler.seconds_until_next(self.clock.now())
+
+    def wake(self) -> tuple[PollResult, float]:
+        """Fire due events and return the poll result and the next delay.
+
+        When ``day_changed`` is set the caller should fetch the new day's
+        schedule and ``load`` it with ``catch_up=True`` instead of using the
+        returned delay.
+        """
+        now = self.clock.now()
+        result = self.scheduler.poll(now, self.clock.monotonic())
+
+        if result.clock_jumped:
+            event_log.warning("clock_jump", now)
+        for event in result.missed:
+            if event.kind == ADHAN:
+                event_log.warning("adhan_missed", event.name, event.city,
+                                  PrayerScheduler.MISSED_GRACE_MIN)
+            else:
+                event_log.debug("reminder_missed", event.kind, event.name, event.city)
+        for event in result.due:
+            if event.kind == ADHAN:
+                self.trigger(event.name, event.city)
+            elif self._remind is not None:
+                # Notification only; a reminder never plays audio
+                event_log.info("reminder_triggered", event.kind, event.name, event.city)
+                self._remind(event)
+
+        return result, self.scheduler.seconds_until_next(now)
+
+    def trigger(self, prayer_name: str, city: str = "") -> bool:
+        """Notify, then play unless Do Not Disturb is active.
+
+        ``on_triggered`` runs last, so anything it does (e.g. fanning the
+        event out to external sinks) can never delay the audio.
+
+        Returns:
+            True if audio playback started.
+        """
+        self._notify(prayer_name, city)
+        # Skip audio if system Do Not Disturb / Focus Assist is active
+        played = not self._is_dnd() and self._play(prayer_name, city)
+        event_log.info("adhan_triggered", prayer_name, city, played)
+        if self._on_triggered is not None:
+            self._on_triggered(prayer_name, city, played)
+        return played
@@ -0,0 +1,142 @@
+"""System-wide schedule cache shared by every user on a machine.
+
+Lab and kiosk machines run one Adzanid per logged-in user. Pointing them
+all at one directory (``ADZANID_SHARED_CACHE`` or the ``shared_cache_dir``
+setting) lets the first instance that needs a city-day fetch it while the
+others wait on an advisory lock and then read the result.
+
+Layout: one JSON file of untuned base minutes per (method, city), keyed
+by ISO date, exactly as ``ScheduleCache`` rows. Writers hold an exclusive
+lock on a sibling ``.lock`` file and replace the JSON atomically, so
+readers never lock and never see a partial file. Waiting for the lock is
+bounded, so a peer that hangs while holding it can't stall the others.
+
+The directory must be writable by all users without the sticky bit
+(e.g. ``install -d -m 2775 -g users /var/cache/adzanid``), since writers
+replace files created by other users.
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import re
+import sys
+import time
+
+from app.services.prayer_calculator import TIME_KEYS
+from app.services.storage import atomic_write
+
+ENV_VAR = "ADZANID_SHARED_CACHE"
+
+
+def configured_dir(setting: str | None = None) -> str | None:
+    """Return the shared directory from the environment or the user setting."""
+    return os.environ.get(ENV_VAR) or setting or None
+
+
+class LockTimeout(TimeoutError):
+    """Raised when another instance holds a city's lock for too long."""
+
+
+@contextlib.contextmanager
+def _exclusive_lock(path: str, timeout_s: float, poll_s: float = 0.05):
+    """Hold an advisory exclusive lock on ``path`` (created if needed).
+
+    Polls with a non-blocking lock and raises ``LockTimeout`` once
+    ``timeout_s`` has passed without getting it.
+    """
+    # flock works on read-only descriptors, so users other than the one
+    # who created the lock file can still take it on POSIX
+    flags = os.O_RDWR if sys.platform == "win32" else os.O_RDONLY
+    fd = os.open(path, flags | os.O_CREAT, 0o666)
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+
+            def try_lock():
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+            def unlock():
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            def try_lock():
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+            def unlock():
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+        deadline = time.monotonic() + timeout_s
+        while True:
+            try:
+                try_lock()
+                break
+            except OSError:  # held by another instance (EWOULDBLOCK / EACCES)
+                if time.monotonic() >= deadline:
+                    raise LockTimeout(f"{path} held for over {timeout_s:g} s") from None
+                time.sleep(poll_s)
+        try:
+            yield
+        finally:
+            unlock()
+    finally:
+        os.close(fd)
+
+
+class SharedScheduleCache:
+    """Reads and writes per-city schedule files in a shared directory."""
+
+    # Longer than a healthy peer's fetch (two API timeouts plus the hedge)
+    LOCK_TIMEOUT_S = 10.0
+
+    def __init__(self, directory: str, method: int):
+        self._dir = os.path.join(directory, f"m{method}")
+        if not os.path.isdir(self._dir):
+            os.makedirs(self._dir, exist_ok=True)
+            os.chmod(self._dir, 0o2775)  # inherit the shared group, writable by it
+
+    def get(self, city: str, date: datetime.date) -> dict[str, int] | None:
+        """Return the untuned base minutes for a city-day, without locking."""
+        values = self._read(city).get(date.isoformat())
+        if values is None:
+            return None
+        return {k: v for k, v in zip(TIME_KEYS, values) if v >= 0}
+
+    @contextlib.contextmanager
+    def locked(self, city: str):
+        """Serialize writers for ``city``; use around check-fetch-put.
+
+        Raises:
+            LockTimeout: If another instance kept the lock past
+                ``LOCK_TIMEOUT_S``.
+        """
+        with _exclusive_lock(f"{self._path(city)}.lock", self.LOCK_TIMEOUT_S):
+            yield
+
+    def put(self, city: str, date: datetime.date, base_minutes: dict[str, int]):
+        """Merge one city-day into the shared file (caller holds ``locked``)."""
+        days = self._read(city)
+        days[date.isoformat()] = [base_minutes.get(key, -1) for key in TIME_KEYS]
+
+        # Keep the file small: drop days more than a week in the past
+        horizon = (date - datetime.timedelta(days=7)).isoformat()
+        days = {d: v for d, v in days.items() if d >= horizon}
+
+        path = self._path(city)
+        atomic_write(path, json.dumps(days, separators=(",", ":")).encode("utf-8"))
+        os.chmod(path, 0o664)  # let other users in the group replace it later
+
+    def _path(self, city: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "-", city.lower()).strip("-")
+        return os.path.join(self._dir, f"{slug}.json")
+
+    def _read(self, city: str) -> dict[str, list[int]]:
+        try:
+            with open(self._path(city), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
@@ -0,0 +1,91 @@
+"""Single-instance guard with local-socket IPC to the running instance."""
+
+import getpass
+import os
+import tempfile
+import time
+
+from PyQt6.QtCore import QObject, QLockFile, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+from app.constants import APP_NAME
+
+
+class SingleInstance(QObject):
+    """Ensures one running instance per user and relays commands to it.
+
+    The lock file decides which process is primary. A secondary process
+    only needs QtCore/QtNetwork (no QApplication, widgets or event loop)
+    to hand its command to the primary over a local socket and exit.
+    """
+
+    message_received = pyqtSignal(str)
+
+    CONNECT_TIMEOUT_MS = 300
+    # How long a secondary keeps retrying while the primary is starting up
+    SEND_TIMEOUT_S = 5.0
+    RETRY_DELAY_S = 0.05
+    MAX_RETRY_DELAY_S = 0.5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._name = f"{APP_NAME}-{getpass.getuser()}"
+        self._lock = QLockFile(
+            os.path.join(tempfile.gettempdir(), f"{self._name}.lock")
+        )
+        self._lock.setStaleLockTime(0)
+        self._server: QLocalServer | None = None
+
+    def acquire(self) -> bool:
+        """Return True if this process is the primary instance."""
+        return self._lock.tryLock(0)
+
+    def send(self, message: str) -> bool:
+        """Deliver ``message`` to the primary instance.
+
+        A primary that holds the lock but isn't listening yet is retried
+        with a growing delay for up to ``SEND_TIMEOUT_S``.
+
+        Returns:
+            True if the primary received it.
+        """
+        deadline = time.monotonic() + self.SEND_TIMEOUT_S
+        delay = self.RETRY_DELAY_S
+        while True:
+            socket = QLocalSocket()
+            socket.connectToServer(self._name)
+            if socket.waitForConnected(self.CONNECT_TIMEOUT_MS):
+                socket.write(f"{message}\n".encode("utf-8"))
+                delivered = socket.waitForBytesWritten(self.CONNECT_TIMEOUT_MS)
+                socket.disconnectFromServer()
+                return delivered
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, self.MAX_RETRY_DELAY_S)
+
+    def listen(self) -> bool:
+        """Start accepting commands (primary only, after ``acquire``).
+
+        Call it as early as possible. Connections are accepted and read
+        only while the event loop runs, so commands sent before then are
+        held by the socket until ``message_received`` has a receiver.
+        """
+        # We hold the lock, so any existing socket is left over from a crash
+        QLocalServer.removeServer(self._name)
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        return self._server.listen(self._name)
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            socket.readyRead.connect(lambda s=socket: self._read(s))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def _read(self, socket: QLocalSocket):
+        while socket.canReadLine():
+            line = bytes(socket.readLine()).decode("utf-8").strip()
+            if line:
+                self.message_received.emit(line)
@@ -0,0 +1,30 @@
+"""Helpers for per-user data files."""
+
+import os
+import sys
+
+from app.constants import APP_NAME
+
+
+def user_data_dir() -> str:
+    """Return (and create) the per-user data directory for the current platform."""
+    if sys.platform == "win32":
+        root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        path = os.path.join(root, APP_NAME)
+    elif sys.platform == "darwin":
+        path = os.path.expanduser(f"~/Library/Application Support/{APP_NAME}")
+    else:
+        root = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        path = os.path.join(root, APP_NAME.lower())
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Write ``data`` to ``path`` so readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -1,51 +1,81 @@
 """Service for managing application themes (dark/light)."""
 
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QColor, QFont, QPalette
+from PyQt6.QtWidgets import QApplication, QWidget
 
 
-class ThemeManager:
-    """Manages the application's dark/light theme stylesheets."""
-
-    DARK_STYLE = """
-    QMainWindow, QWidget { background-color: #2b2b2b; color: #ffffff; }
-    QTabWidget::pane { border: 1px solid #444; top: -1px; }
-    QTabBar::tab { background: #3b3b3b; color: #fff; padding: 8px 20px; border: 1px solid #555; margin-right: 2px; }
-    QTabBar::tab:selected { background: #505050; border-bottom-color: #505050; font-weight: bold; }
-
-    QCheckBox { spacing: 5px; color: #ffffff; background: transparent; }
-    QCheckBox::indicator { width: 15px; height: 15px; border: 1px solid #888; background: #3b3b3b; }
-    QCheckBox::indicator:checked { background: #0078d7; border: 1px solid #0078d7; }
-
-    QComboBox, QPushButton, QLineEdit {
-        background-color: #3b3b3b; color: white; border: 1px solid #555; padding: 6px; border-radius: 4px;
-    }
-    QComboBox:hover, QPushButton:hover { background-color: #4a4a4a; border: 1px solid #777; }
-    QComboBox::drop-down { border: 0px; }
+# Colors of each theme, by palette role. Disabled text (e.g. a stale
+# schedule) uses the "disabled" entry.
+THEME_COLORS = {
+    "dark": {
+        "window": "#2b2b2b",
+        "text": "#ffffff",
+        "base": "#3b3b3b",
+        "alternate": "#444444",
+        "button": "#3b3b3b",
+        "mid": "#555555",
+        "disabled": "#777777",
+        "muted": "#888888",
+    },
+    "light": {
+        "window": "#f5f5f5",
+        "text": "#000000",
+        "base": "#ffffff",
+        "alternate": "#f0f0f0",
+        "button": "#ffffff",
+        "mid": "#cccccc",
+        "disabled": "#a0a0a0",
+        "muted": "#888888",
+    },
+}
+ACCENT = "#0078d7"
+
+# Theme-independent: colors come from the palette, so this sheet is parsed
+# once and never replaced when the theme changes.
+STYLESHEET = """
+QTabBar::tab { padding: 8px 20px; margin-right: 2px; }
+QTabBar::tab:selected { font-weight: bold; }
+QCheckBox { spacing: 5px; }
+"""
+
+
+def styled_font(pixel_size: int, bold: bool = False) -> QFont:
+    """Return the application font at ``pixel_size``, optionally bold."""
+    font = QFont(QApplication.font())
+    font.setPixelSize(pixel_size)
+    font.setBold(bold)
+    return font
+
+
+def tint(widget: QWidget, background: str | None = None, foreground: str | None = None):
+    """Give ``widget`` fixed colors that survive theme switches.
+
+    Used for the few semantic colors (update banner, stop button) that
+    are the same in both themes.
     """
+    palette = widget.palette()
+    if background is not None:
+        for role in (QPalette.ColorRole.Window, QPalette.ColorRole.Button):
+            palette.setColor(role, QColor(background))
+        widget.setAutoFillBackground(True)
+    if foreground is not None:
+        for role in (QPalette.ColorRole.WindowText, QPalette.ColorRole.ButtonText):
+            palette.setColor(role, QColor(foreground))
+    widget.setPalette(palette)
 
-    LIGHT_STYLE = """
-    QMainWindow, QWidget { background-color: #f5f5f5; color: #000000; }
-    QTabWidget::pane { border: 1px solid #d0d0d0; top: -1px; background: white; }
-    QTabBar::tab { background: #e0e0e0; color: #000; padding: 8px 20px; border: 1px solid #ccc; margin-right: 2px; }
-    QTabBar::tab:selected { background: #ffffff; border-bottom-color: #ffffff; font-weight: bold; }
-
-    QCheckBox { spacing: 5px; color: #000000; background: transparent; }
-    QCheckBox::indicator { width: 15px; height: 15px; border: 1px solid #aaa; background: white; }
-    QCheckBox::indicator:checked { background: #0078d7; border: 1px solid #0078d7; }
-
-    QComboBox, QPushButton, QLineEdit {
-        background-color: #ffffff; color: #000000; border: 1px solid #ccc; padding: 6px; border-radius: 4px;
-    }
-    QComboBox:hover, QPushButton:hover {
-        background-color: #e6f7ff; border: 1px solid #0078d7;
-    }
-    QComboBox QAbstractItemView {
-        background-color: #ffffff; color: #000000; selection-background-color: #0078d7; selection-color: #ffffff;
-    }
+
+class ThemeManager:
+    """Switches between precomputed dark and light palettes.
+
+    Switching themes is a palette swap: Qt repaints widgets with the new
+    colors but never re-parses a stylesheet or re-polishes the widget tree.
     """
 
+    _palettes: dict[str, QPalette] = {}
+
     def __init__(self):
         self._is_dark = False
+        self._initialized = False
 
     @property
     def is_dark(self) -> bool:
@@ -57,5 +87,41 @@ class ThemeManager:
 
     def apply(self):
         """Apply the current theme to the application."""
-        style = self.DARK_STYLE if self._is_dark else self.LIGHT_STYLE
-        QApplication.instance().setStyleSheet(style)
+        app = QApplication.instance()
+        if not self._initialized:
+            # Fusion draws everything from the palette on every platform
+            app.setStyle("Fusion")
+            app.setStyleSheet(STYLESHEET)
+            self._initialized = True
+        app.setPalette(self.palette("dark" if self._is_dark else "light"))
+
+    @classmethod
+    def palette(cls, theme: str) -> QPalette:
+        """Return the cached palette for ``theme``, building it on first use."""
+        if theme not in cls._palettes:
+            cls._palettes[theme] = cls._build_palette(THEME_COLORS[theme])
+        return cls._palettes[theme]
+
+    @staticmethod
+    def _build_palette(colors: dict[str, str]) -> QPalette:
+        role = QPalette.ColorRole
+        palette = QPalette()
+        for roles, color in (
+            ((role.Window,), colors["window"]),
+            ((role.WindowText, role.Text, role.ButtonText, role.ToolTipText,
+              role.BrightText), colors["text"]),
+            ((role.Base, role.ToolTipBase), colors["base"]),
+            ((role.AlternateBase,), colors["alternate"]),
+            ((role.Button,), colors["button"]),
+            ((role.Mid, role.Dark, role.Shadow), colors["mid"]),
+            ((role.PlaceholderText,), colors["muted"]),
+            ((role.Highlight, role.Link), ACCENT),
+            ((role.HighlightedText,), "#ffffff"),
+        ):
+            for r in roles:
+                palette.setColor(r, QColor(color))
+
+        disabled = QPalette.ColorGroup.Disabled
+        for r in (role.WindowText, role.Text, role.ButtonText):
+            palette.setColor(disabled, r, QColor(colors["disabled"]))
+        return palette
@@ -1,9 +1,25 @@
 """Service for checking application updates from GitHub."""
 
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+
 import requests
 from packaging import version
 
 from app.constants import APP_VERSION
+from app.services.event_log import event_log
+from app.services.storage import user_data_dir
+
+# Release asset extensions per platform, most preferred first
+ASSET_EXTENSIONS = {
+    "win32": (".exe", ".msi"),
+    "darwin": (".dmg",),
+    "linux": (".AppImage", ".deb"),
+}
 
 
 class UpdateService:
@@ -23,11 +39,18 @@ class UpdateService:
             - 'update_available': bool
             - 'latest_version': str (if available)
             - 'download_url': str
+            - 'asset_url', 'asset_name', 'sha256', 'checksums_url': this
+              platform's release asset and where its checksum comes from
+              (None when unavailable; see ``resolve_sha256``)
         """
         result = {
             'update_available': False,
             'latest_version': None,
             'download_url': self.DOWNLOAD_URL,
+            'asset_url': None,
+            'asset_name': None,
+            'sha256': None,
+            'checksums_url': None,
         }
 
         try:
@@ -40,6 +63,7 @@ class UpdateService:
                 if tag_name:
                     self._latest_version = tag_name
                     result['latest_version'] = tag_name
+                    result.update(self._platform_asset(data.get('assets', [])))
                     
                     # Compare versions
                     try:
@@ -52,6 +76,175 @@ class UpdateService:
                         
         except Exception as e:
             # Silently fail - don't interrupt app startup for update check failures
-            print(f"Update check failed: {e}")
+            event_log.warning("update_check_failed", e)
 
         return result
+
+    @staticmethod
+    def _platform_asset(assets: list[dict]) -> dict[str, str | None]:
+        """Pick this platform's installer from a release's assets.
+
+        ``sha256`` is filled from the asset's ``digest`` ("sha256:<hex>")
+        when GitHub provides one; otherwise ``checksums_url`` points at a
+        ``SHA256SUMS`` asset for ``resolve_sha256`` to read later, so the
+        check itself makes a single request.
+        """
+        platform = "linux" if sys.platform.startswith("linux") else sys.platform
+        by_name = {asset.get('name', ''): asset for asset in assets}
+        for ext in ASSET_EXTENSIONS.get(platform, ()):
+            for name, asset in by_name.items():
+                if not name.endswith(ext):
+                    continue
+                digest = asset.get('digest') or ""
+                return {
+                    'asset_url': asset.get('browser_download_url'),
+                    'asset_name': name,
+                    'sha256': digest.split(":", 1)[1] if digest.startswith("sha256:") else None,
+                    'checksums_url': by_name.get("SHA256SUMS", {}).get('browser_download_url'),
+                }
+        return {}
+
+    @staticmethod
+    def resolve_sha256(result: dict) -> str | None:
+        """Return the asset's SHA-256, reading ``SHA256SUMS`` if needed.
+
+        Blocking; call it off the UI thread. None if no checksum is published.
+        """
+        if result['sha256'] or not result['checksums_url']:
+            return result['sha256']
+        try:
+            sums = requests.get(result['checksums_url'], timeout=5).text
+        except requests.RequestException as e:
+            event_log.warning("update_checksums_failed", e)
+            return None
+        name = re.escape(result['asset_name'])
+        match = re.search(rf"^([0-9a-f]{{64}})\s+\*?{name}$", sums, re.M)
+        return match.group(1) if match else None
+
+
+class UpdateDownloader:
+    """Resumable, throttled download of a release asset with SHA-256 check.
+
+    The file is fetched in ``RANGE_BYTES`` HTTP Range requests into
+    ``<name>.part``, so a dropped connection costs at most one range and
+    a restart (even days later) continues where it stopped. Bytes are
+    hashed as they are written; on resume the partial file is re-hashed
+    in blocks from disk. Nothing is held in memory beyond one block.
+    """
+
+    RANGE_BYTES = 1024 * 1024
+    BLOCK_BYTES = 64 * 1024
+    RATE_LIMIT_BPS = 256 * 1024  # leave the (often metered) link to everything else
+    MAX_RETRIES = 5
+    TIMEOUT_S = 15
+
+    def __init__(self, rate_limit_bps: int = RATE_LIMIT_BPS):
+        self._rate_limit_bps = rate_limit_bps
+        self._cancel = threading.Event()
+        self._digest = hashlib.sha256()
+
+    @staticmethod
+    def download_dir() -> str:
+        path = os.path.join(user_data_dir(), "updates")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def download(self, url: str, name: str, sha256: str) -> str:
+        """Download ``url`` to the updates folder and return the verified path.
+
+        Raises:
+            requests.RequestException: If a range still fails after retries.
+            ValueError: If the checksum doesn't match (the partial file is
+                deleted so the next attempt starts over).
+            InterruptedError: If ``cancel()`` was called.
+        """
+        folder = self.download_dir()
+        name = os.path.basename(name)
+        path = os.path.join(folder, name)
+        part = path + ".part"
+        # Installers (and partial downloads) of older releases are no longer needed
+        for entry in os.listdir(folder):
+            if entry not in (name, name + ".part"):
+                try:
+                    os.remove(os.path.join(folder, entry))
+                except OSError:
+                    pass
+        if os.path.exists(path) and self._sha256_of(path) == sha256.lower():
+            return path
+
+        self._digest = hashlib.sha256()
+        if os.path.exists(part):
+            with open(part, "rb") as f:
+                for block in iter(lambda: f.read(self.BLOCK_BYTES), b""):
+                    self._digest.update(block)
+
+        offset, total = 0, None
+        with open(part, "ab") as f:
+            while total is None or offset < total:
+                for attempt in range(self.MAX_RETRIES):
+                    # A failed range may have appended some bytes; continue after them
+                    f.flush()
+                    offset = f.seek(0, os.SEEK_END)
+                    try:
+                        offset, total = self._fetch_range(url, f, offset)
+                        break
+                    except (requests.ConnectionError, requests.Timeout,
+                            requests.exceptions.ChunkedEncodingError) as e:
+                        event_log.warning("update_download_retry", offset, e)
+                        if attempt == self.MAX_RETRIES - 1:
+                            raise
+                        time.sleep(2 ** attempt)
+
+        if self._digest.hexdigest() != sha256.lower():
+            os.remove(part)
+            raise ValueError(f"checksum mismatch for {name}")
+        os.replace(part, path)
+        return path
+
+    def _fetch_range(self, url: str, f, offset: int) -> tuple[int, int]:
+        """Append one range starting at ``offset``; return (new offset, total size)."""
+        end = offset + self.RANGE_BYTES - 1
+        with requests.get(
+            url,
+            headers={"Range": f"bytes={offset}-{end}"},
+            stream=True,
+            timeout=self.TIMEOUT_S,
+        ) as resp:
+            if resp.status_code == 416:  # already complete
+                return offset, offset
+            resp.raise_for_status()
+            if resp.status_code == 206:
+                total = int(resp.headers["Content-Range"].rsplit("/", 1)[1])
+            else:
+                # Server ignored the range: start over with the whole body
+                f.seek(0)
+                f.truncate()
+                self._digest = hashlib.sha256()
+                offset = 0
+                total = int(resp.headers.get("Content-Length", 0)) or None
+
+            started = time.monotonic()
+            received = 0
+            for block in resp.iter_content(self.BLOCK_BYTES):
+                if self._cancel.is_set():
+                    raise InterruptedError("update download cancelled")
+                f.write(block)
+                self._digest.update(block)
+                offset += len(block)
+                received += len(block)
+                # Throttle: never run ahead of the byte budget for the elapsed time
+                ahead = received / self._rate_limit_bps - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+            f.flush()
+        return offset, total if total is not None else offset
+
+    def _sha256_of(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(self.BLOCK_BYTES), b""):
+                digest.update(block)
+        return digest.hexdigest()
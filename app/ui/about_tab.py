@@ -4,6 +4,7 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
 from PyQt6.QtCore import Qt
 
 from app.constants import APP_TITLE, APP_VERSION, GITHUB_URL, AUTHOR, COPYRIGHT_YEAR
+from app.services.theme_manager import styled_font, tint
 
 
 class AboutTab(QWidget):
@@ -22,13 +23,14 @@ class AboutTab(QWidget):
         # Application title
         lbl_title = QLabel(APP_TITLE)
         lbl_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl_title.setStyleSheet("font-size: 22px; font-weight: bold;")
+        lbl_title.setFont(styled_font(22, bold=True))
         layout.addWidget(lbl_title)
 
         # Version
         lbl_ver = QLabel(f"Versi {APP_VERSION}")
         lbl_ver.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl_ver.setStyleSheet("font-size: 14px; color: #888;")
+        lbl_ver.setFont(styled_font(14))
+        tint(lbl_ver, foreground="#888888")
         layout.addWidget(lbl_ver)
 
         layout.addSpacing(20)
@@ -42,7 +44,8 @@ class AboutTab(QWidget):
         lbl_desc = QLabel(desc_text)
         lbl_desc.setWordWrap(True)
         lbl_desc.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl_desc.setStyleSheet("font-size: 14px; padding: 0 20px;")
+        lbl_desc.setFont(styled_font(14))
+        lbl_desc.setContentsMargins(20, 0, 20, 0)
         layout.addWidget(lbl_desc)
 
         layout.addSpacing(30)
@@ -65,7 +68,8 @@ class AboutTab(QWidget):
         layout.addSpacing(20)
         lbl_copy = QLabel(f"\u00a9 {COPYRIGHT_YEAR} {AUTHOR}")
         lbl_copy.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl_copy.setStyleSheet("font-size: 12px; color: #888;")
+        lbl_copy.setFont(styled_font(12))
+        tint(lbl_copy, foreground="#888888")
         layout.addWidget(lbl_copy)
 
         layout.addStretch()
@@ -0,0 +1,69 @@
+"""Large HH:MM:SS clock that repaints only the digits that changed."""
+
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtGui import QPainter
+from PyQt6.QtCore import QEvent, QRect, QSize, Qt
+
+from app.services.theme_manager import styled_font
+
+
+class ClockWidget(QWidget):
+    """Paints a fixed-width time string in equal character cells.
+
+    Every character gets a cell as wide as the widest digit, so the
+    widget's size never depends on the time shown: ``set_time`` causes
+    no size-hint change or layout pass, and invalidates only the cells
+    whose character changed (usually just the last second digit).
+    """
+
+    TEMPLATE = "00:00:00"
+
+    def __init__(self, pixel_size: int = 40, parent=None):
+        super().__init__(parent)
+        self._text = self.TEMPLATE
+        self.setFont(styled_font(pixel_size, bold=True))
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self._update_metrics()
+
+    def set_time(self, text: str):
+        """Show ``text`` (same length as ``TEMPLATE``), repainting changed cells only."""
+        if text == self._text:
+            return
+        old, self._text = self._text, text
+        for i, (before, after) in enumerate(zip(old, text)):
+            if before != after:
+                self.update(self._cell(i))
+
+    def text(self) -> str:
+        return self._text
+
+    def sizeHint(self) -> QSize:
+        return QSize(self._cell_width * len(self.TEMPLATE), self._height)
+
+    def minimumSizeHint(self) -> QSize:
+        return self.sizeHint()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.FontChange:
+            self._update_metrics()
+            self.updateGeometry()
+            self.update()
+        super().changeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setPen(self.palette().windowText().color())
+        dirty = event.rect()
+        for i, char in enumerate(self._text):
+            cell = self._cell(i)
+            if cell.intersects(dirty):
+                painter.drawText(cell, Qt.AlignmentFlag.AlignCenter, char)
+
+    def _update_metrics(self):
+        metrics = self.fontMetrics()
+        self._cell_width = max(metrics.horizontalAdvance(d) for d in "0123456789")
+        self._height = metrics.height()
+
+    def _cell(self, index: int) -> QRect:
+        left = (self.width() - self._cell_width * len(self.TEMPLATE)) // 2
+        return QRect(left + index * self._cell_width, 0, self._cell_width, self.height())
@@ -1,29 +1,69 @@
 """Main application window that coordinates services and UI tabs."""
 
 import datetime
+import math
 import os
+import sys
+import threading
 
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QTabWidget, QMessageBox, QStyle
-from PyQt6.QtCore import QTimer, QSettings
+from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QTabWidget, QMessageBox, QStyle
+from PyQt6.QtCore import Qt, QTimer, QSettings, QUrl, pyqtSignal
 from PyQt6.QtGui import QIcon
 
-from app.constants import APP_TITLE, SETTINGS_ORG, SETTINGS_APP, DEFAULT_ADHAN_PATH, ICON_PATH
+from app.constants import (
+    APP_TITLE, SETTINGS_ORG, SETTINGS_APP, DEFAULT_ADHAN_PATH, ICON_PATH, PRAYER_NAMES,
+    CITY_COORDINATES, ALERT_NAME_MAP,
+)
 from app.services.prayer_time_service import PrayerTimeService
+from app.services.prayer_calculator import utc_offset_for
+from app.services.city_usage import CityUsage
 from app.services.audio_service import AudioService
+from app.services.loudness_service import LoudnessService
 from app.services.theme_manager import ThemeManager
 from app.services.startup_service import StartupService
-from app.services.update_service import UpdateService
+from app.services.update_service import UpdateDownloader, UpdateService
 from app.services.dnd_service import is_dnd_enabled
+from app.services.scheduler_service import ADHAN, REMINDER, AdhanController, ScheduledEvent
+from app.services.shared_cache import configured_dir
+from app.services.event_sinks import EventDispatcher, PrayerEvent, load_sinks
+from app.services.event_log import event_log
+from app.services import memory_monitor
 from app.ui.schedule_tab import ScheduleTab
 from app.ui.settings_tab import SettingsTab
 from app.ui.about_tab import AboutTab
 from app.ui.system_tray import SystemTrayManager
 
 
+def _lower_thread_priority():
+    """Run the calling background thread at idle priority where supported."""
+    if sys.platform.startswith("linux"):
+        # Linux niceness is per thread: only this worker yields the CPU
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except OSError:
+            pass
+
+
 class MainWindow(QMainWindow):
     """Top-level window that wires together services, tabs, and the system tray."""
 
-    def __init__(self):
+    LOG_FLUSH_INTERVAL_MS = 5 * 60 * 1000
+
+    # Prefetch the top cities once the selection has been stable this long
+    PREFETCH_IDLE_MS = 60 * 1000
+    PREFETCH_CITIES = 3
+    PREFETCH_DAILY_BUDGET = 12  # API requests per day
+
+    # Background fetch result: generation, city, times (None on failure), catch_up
+    _schedule_fetched = pyqtSignal(int, str, object, bool)
+    _prefetch_finished = pyqtSignal(int)  # requests used
+    _monitored_fetched = pyqtSignal(str, object, bool)  # city, times or None, catch_up
+    _update_checked = pyqtSignal(object)  # UpdateService.check_for_updates() result
+    _update_downloaded = pyqtSignal(str, str)  # version, installer path
+
+    UPCOMING_EVENTS = 5
+
+    def __init__(self, clock=None):
         super().__init__()
 
         # --- Configuration ---
@@ -34,18 +74,45 @@ class MainWindow(QMainWindow):
 
         self._settings = QSettings(SETTINGS_ORG, SETTINGS_APP)
         self._prayer_times: dict[str, str] = {}
-        self._last_triggered_time: str | None = None
-        self._current_date: str | None = None  # Track date to detect day change
+        # Extra monitored cities → today's times (the selected city is not in here)
+        self._monitored_times: dict[str, dict[str, str]] = {}
+        self._fetch_generation = 0
+        self._city_usage = CityUsage(self._settings.value("city_usage", ""))
+        self._prefetching = False
 
         # --- Services ---
-        self._prayer_service = PrayerTimeService()
+        self._prayer_service = PrayerTimeService(
+            shared_cache_dir=configured_dir(
+                self._settings.value("shared_cache_dir", "")
+            ),
+            mirror_url=self._settings.value("api_mirror_url", ""),
+        )
         self._audio_service = AudioService()
         self._audio_service.playback_finished.connect(
             lambda: self._update_audio_buttons(playing=False)
         )
+        self._loudness_service = LoudnessService(self)
+        self._loudness_service.analyzed.connect(
+            lambda path, info: self._audio_service.set_normalization(
+                path, info.buffer_path, info.volume_factor
+            )
+        )
         self._theme_manager = ThemeManager()
         self._startup_service = StartupService()
         self._update_service = UpdateService()
+        self._event_dispatcher = EventDispatcher(load_sinks())
+        self._adhan = AdhanController(
+            notify=lambda prayer, city: self._tray.notify(
+                "Waktu Sholat Tiba",
+                f"Saatnya sholat {prayer} di {city}" if city else f"Saatnya sholat {prayer}",
+            ),
+            play=self._play_adhan,
+            is_dnd=is_dnd_enabled,
+            clock=clock,
+            on_triggered=self._publish_prayer_event,
+            remind=self._notify_reminder,
+        )
+        self._clock = self._adhan.clock
 
         # Load persisted theme preference before building UI
         self._theme_manager.is_dark = self._settings.value(
@@ -57,12 +124,47 @@ class MainWindow(QMainWindow):
         self._init_tabs()
         self._tray = SystemTrayManager(self)
 
+        # --- Predictive prefetch of frequently used cities (when idle) ---
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.timeout.connect(self._prefetch_cities)
+
+        # --- Tray countdown (single-shot, re-armed on each minute boundary) ---
+        self._countdown_timer = QTimer(self)
+        self._countdown_timer.setSingleShot(True)
+        self._countdown_timer.timeout.connect(self._update_countdown)
+
+        # --- Adhan scheduler (single-shot, re-armed after each wake-up) ---
+        # Created before settings are restored: restoring the city refetches
+        self._scheduler_timer = QTimer(self)
+        self._scheduler_timer.setSingleShot(True)
+        self._scheduler_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._scheduler_timer.timeout.connect(self._on_scheduler_wake)
+
+        # --- First paint from the last known schedule (revalidated below) ---
+        self._paint_last_schedule()
+
         # --- Connect signals ---
         self._connect_signals()
 
         # --- Restore saved settings ---
         self._load_settings()
 
+        # --- Event log: written to disk lazily, never on the trigger path ---
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.timeout.connect(self._flush_event_log)
+        self._log_flush_timer.start(self.LOG_FLUSH_INTERVAL_MS)
+        QApplication.instance().aboutToQuit.connect(self._flush_event_log)
+
+        # --- Opt-in memory monitor for long-running sessions ---
+        self._memory_monitor = None
+        if memory_monitor.enabled(self._settings.value("memory_monitor", False, type=bool)):
+            self._memory_monitor = memory_monitor.MemoryMonitor()
+            self._memory_monitor.start()
+            self._memory_timer = QTimer(self)
+            self._memory_timer.timeout.connect(self._memory_monitor.sample)
+            self._memory_timer.start(memory_monitor.MemoryMonitor.INTERVAL_S * 1000)
+
         # --- Periodic timer (every second) ---
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._on_tick)
@@ -108,10 +210,15 @@ class MainWindow(QMainWindow):
 
     def _connect_signals(self):
         # Settings tab signals → main window handlers
-        self._settings_tab.city_changed.connect(self._fetch_prayer_times)
+        self._settings_tab.city_changed.connect(self._on_city_changed)
+        self._settings_tab.monitored_cities_changed.connect(self._on_monitored_cities_changed)
         self._settings_tab.mp3_path_changed.connect(self._on_mp3_path_changed)
+        self._settings_tab.prayer_audio_changed.connect(self._on_prayer_audio_changed)
+        self._settings_tab.reminder_changed.connect(self._on_reminder_changed)
+        self._settings_tab.alert_toggled.connect(self._on_alert_toggled)
         self._settings_tab.dark_mode_toggled.connect(self._on_dark_mode_toggled)
         self._settings_tab.minimize_to_tray_toggled.connect(self._on_minimize_to_tray_toggled)
+        self._settings_tab.tray_badge_toggled.connect(self._on_tray_badge_toggled)
         self._settings_tab.startup_toggled.connect(self._on_startup_toggled)
         self._settings_tab.test_audio_requested.connect(self._on_test_audio)
         self._settings_tab.stop_audio_requested.connect(self._on_stop_audio)
@@ -124,18 +231,49 @@ class MainWindow(QMainWindow):
 
         # System tray signals
         self._tray.show_requested.connect(self._show_window)
+        self._tray.dump_log_requested.connect(self._dump_event_log)
+
+        self._schedule_fetched.connect(self._on_schedule_fetched)
+        self._prefetch_finished.connect(self._on_prefetch_finished)
+        self._update_checked.connect(self._on_update_checked)
+        self._update_downloaded.connect(self._on_update_downloaded)
+        self._monitored_fetched.connect(self._on_monitored_fetched)
 
     # ------------------------------------------------------------------
     # Settings persistence
     # ------------------------------------------------------------------
 
     def _load_settings(self):
+        # Regional ihtiyat offsets; re-tunes cached schedules in place
+        tune = self._settings.value("tune", PrayerTimeService.TUNE)
+        if tune != self._prayer_service.tune:
+            self._prayer_service.set_tune(tune)
+
+        monitored = self._settings.value("monitored_cities", "")
+        self._settings_tab.set_monitored_cities([c for c in monitored.split("|") if c])
+
         saved_city = self._settings.value("city", "Jakarta")
         self._settings_tab.set_city(saved_city)
 
         saved_mp3 = self._settings.value("mp3_path", DEFAULT_ADHAN_PATH)
         if saved_mp3:
             self._settings_tab.set_mp3_path_label(saved_mp3)
+            self._loudness_service.analyze(saved_mp3)
+
+        prayer_audio = {
+            prayer: self._settings.value(f"audio/{prayer}", "")
+            for prayer in PRAYER_NAMES
+        }
+        self._settings_tab.set_prayer_audio_paths(prayer_audio)
+        for path in prayer_audio.values():
+            if path:
+                self._loudness_service.analyze(path)
+
+        self._settings_tab.set_reminders(self._reminders())
+        self._settings_tab.set_alerts({
+            name: self._settings.value(f"alert/{name}", False, type=bool)
+            for name in ALERT_NAME_MAP
+        })
 
         is_dark = self._settings.value("dark_mode", False, type=bool)
         self._settings_tab.chk_dark.setChecked(is_dark)
@@ -143,6 +281,9 @@ class MainWindow(QMainWindow):
         is_tray = self._settings.value("minimize_to_tray", True, type=bool)
         self._settings_tab.chk_tray.setChecked(is_tray)
 
+        is_badge = self._settings.value("tray_badge", False, type=bool)
+        self._settings_tab.chk_tray_badge.setChecked(is_badge)
+
         is_startup = self._settings.value("startup", False, type=bool)
         self._settings_tab.chk_startup.setChecked(is_startup)
 
@@ -157,6 +298,43 @@ class MainWindow(QMainWindow):
 
     def _on_mp3_path_changed(self, path: str):
         self._settings.setValue("mp3_path", path)
+        self._loudness_service.analyze(path)
+        self._preload_upcoming_audio()
+
+    def _on_prayer_audio_changed(self, prayer: str, path: str):
+        if path:
+            self._settings.setValue(f"audio/{prayer}", path)
+            self._loudness_service.analyze(path)
+        else:
+            self._settings.remove(f"audio/{prayer}")
+        self._preload_upcoming_audio()
+
+    def _on_reminder_changed(self, prayer: str, minutes: int):
+        self._settings.setValue(f"reminder/{prayer}", minutes)
+        self._arm_scheduler(self._adhan.set_reminder(prayer, minutes))
+
+    def _on_alert_toggled(self, name: str, enabled: bool):
+        self._settings.setValue(f"alert/{name}", enabled)
+        time_str = self._alert_times().get(name) if enabled else None
+        self._arm_scheduler(self._adhan.set_alert(name, time_str))
+
+    def _reminders(self) -> dict[str, int]:
+        """Minutes of warning before each prayer (0 = no reminder)."""
+        return {
+            prayer: self._settings.value(f"reminder/{prayer}", 0, type=int)
+            for prayer in PRAYER_NAMES
+        }
+
+    def _alert_times(self) -> dict[str, str]:
+        """Today's times of the enabled Imsak/Terbit alerts for the selected city."""
+        enabled = [
+            name for name in ALERT_NAME_MAP
+            if self._settings.value(f"alert/{name}", False, type=bool)
+        ]
+        if not enabled or not self._prayer_times:
+            return {}
+        times = self._prayer_service.alert_times(self._settings_tab.selected_city)
+        return {name: times[name] for name in enabled}
 
     def _on_dark_mode_toggled(self, enabled: bool):
         self._settings.setValue("dark_mode", enabled)
@@ -166,6 +344,11 @@ class MainWindow(QMainWindow):
     def _on_minimize_to_tray_toggled(self, enabled: bool):
         self._settings.setValue("minimize_to_tray", enabled)
 
+    def _on_tray_badge_toggled(self, enabled: bool):
+        self._settings.setValue("tray_badge", enabled)
+        self._tray.set_badge_enabled(enabled)
+        self._update_countdown()
+
     def _on_startup_toggled(self, enabled: bool):
         self._settings.setValue("startup", enabled)
         try:
@@ -185,70 +368,337 @@ class MainWindow(QMainWindow):
     # Prayer time fetching
     # ------------------------------------------------------------------
 
+    def _on_city_changed(self, city: str):
+        # Only the user's own picks count towards prefetch priority
+        self._city_usage.record(city)
+        self._settings.setValue("city_usage", self._city_usage.dumps())
+        self._fetch_prayer_times()
+
     def _fetch_prayer_times(self):
+        self._refresh_schedule(catch_up=False)
+        # Time shifts are relative to the selected city, so reload the others
+        self._refresh_monitored(catch_up=False)
+        # Restarted on every switch, so prefetch waits until the user settles
+        self._prefetch_timer.start(self.PREFETCH_IDLE_MS)
+
+    def _refresh_schedule(self, catch_up: bool):
+        """Fetch today's schedule in the background; labels keep showing the old one."""
         city = self._settings_tab.selected_city
         self._settings.setValue("city", city)
 
+        self._fetch_generation += 1
+        generation = self._fetch_generation
+
+        def work():
+            try:
+                times = self._prayer_service.fetch(city)
+            except Exception as e:
+                event_log.warning("schedule_fetch_failed", city, e)
+                times = None
+            self._schedule_fetched.emit(generation, city, times, catch_up)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _on_schedule_fetched(
+        self, generation: int, city: str, times: dict[str, str] | None, catch_up: bool
+    ):
+        if generation != self._fetch_generation:
+            return  # superseded, e.g. the city changed while fetching
+
+        today = datetime.date.today()
+        if times is not None:
+            self._show_schedule(city, today, times)
+            self._save_last_schedule(city, today, times)
+        elif self._last_schedule() != (city, today, self._prayer_times):
+            self._prayer_times = {}
+            self._schedule_tab.set_info_text("Gagal mengambil data")
+        # else: keep today's snapshot on screen and in the scheduler
+
+        # An empty schedule still pins today's date, so a failed fetch is
+        # retried on the next day change rather than on every wake-up.
+        # Reminders and alerts apply to the selected city only.
+        self._arm_scheduler(self._adhan.load(
+            self._prayer_times, catch_up,
+            reminders=self._reminders(), alerts=self._alert_times(),
+        ))
+        self._on_events_changed()
+
+    # ------------------------------------------------------------------
+    # Monitored cities (events merged into the same scheduler queue)
+    # ------------------------------------------------------------------
+
+    def _monitored_cities(self) -> list[str]:
+        primary = self._settings_tab.selected_city
+        return [c for c in self._settings_tab.monitored_cities if c != primary]
+
+    def _on_monitored_cities_changed(self, cities: list[str]):
+        self._settings.setValue("monitored_cities", "|".join(cities))
+        self._refresh_monitored(catch_up=False)
+
+    def _refresh_monitored(self, catch_up: bool):
+        """Fetch today's schedule of every monitored city in one background thread."""
+        cities = self._monitored_cities()
+        for city in list(self._monitored_times):
+            if city not in cities:
+                del self._monitored_times[city]
+                self._arm_scheduler(self._adhan.unload(city))
+        if not cities:
+            self._on_events_changed()
+            return
+
+        def work():
+            for city in cities:
+                try:
+                    times = self._prayer_service.fetch(city)
+                except Exception as e:
+                    event_log.warning("schedule_fetch_failed", city, e)
+                    times = None
+                self._monitored_fetched.emit(city, times, catch_up)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _on_monitored_fetched(self, city: str, times: dict[str, str] | None, catch_up: bool):
+        if city not in self._monitored_cities():
+            return  # removed (or made the selected city) while fetching
+        if times is None:
+            self._monitored_times.pop(city, None)
+            self._arm_scheduler(self._adhan.unload(city))
+        else:
+            self._monitored_times[city] = times
+            self._arm_scheduler(
+                self._adhan.load(times, catch_up, city, self._shift_minutes(city))
+            )
+        self._on_events_changed()
+
+    def _shift_minutes(self, city: str) -> int:
+        """Minutes to add to ``city``'s local times to get the selected city's clock.
+
+        The machine clock is assumed to run on the selected city's zone,
+        so e.g. a Makassar (WITA) adhan is announced an hour earlier on a
+        Jakarta (WIB) schedule.
+        """
+        primary = self._settings_tab.selected_city
+        return 60 * (
+            utc_offset_for(*CITY_COORDINATES[primary]) - utc_offset_for(*CITY_COORDINATES[city])
+        )
+
+    def _on_events_changed(self):
+        """Refresh everything that depends on the next pending events."""
+        self._preload_upcoming_audio()
+        self._update_countdown()
+        rows = []
+        if self._monitored_times:
+            primary = self._settings_tab.selected_city
+            rows = [
+                (f"{event.when:%H:%M}", event.name, event.city or primary)
+                for event in self._adhan.scheduler.upcoming(self.UPCOMING_EVENTS)
+            ]
+        self._schedule_tab.set_upcoming(rows)
+        self._schedule_tab.highlight_prayer(self._next_prayer())
+
+    def _next_prayer(self) -> str | None:
+        """Name of the selected city's next adhan (tomorrow's first after Isya)."""
+        pending = [
+            event for event in (
+                self._adhan.scheduler.find("", ADHAN, name) for name in PRAYER_NAMES
+            ) if event is not None
+        ]
+        if pending:
+            return min(pending).name
+        return PRAYER_NAMES[0] if self._prayer_times else None
+
+    def _prefetch_cities(self):
+        """Warm the cache for the user's other favourite cities in the background."""
+        remaining = self.PREFETCH_DAILY_BUDGET - self._prefetch_budget_used()
+        cities = self._city_usage.top(
+            self.PREFETCH_CITIES, exclude=self._settings_tab.selected_city
+        )
+        if self._prefetching or remaining <= 0 or not cities:
+            return
+        self._prefetching = True
+
+        def work():
+            _lower_thread_priority()
+            used = 0
+            try:
+                used = self._prayer_service.prefetch(cities, remaining)
+            finally:
+                self._prefetch_finished.emit(used)
+
+        threading.Thread(target=work, name="prefetch", daemon=True).start()
+
+    def _on_prefetch_finished(self, used: int):
+        self._prefetching = False
+        if used:
+            today = datetime.date.today().isoformat()
+            total = self._prefetch_budget_used() + used
+            self._settings.setValue("prefetch_budget", f"{today};{total}")
+            event_log.info("prefetched", used)
+
+    def _prefetch_budget_used(self) -> int:
+        """Requests already spent on prefetching today ("YYYY-MM-DD;count")."""
+        day, _, used = self._settings.value("prefetch_budget", "").partition(";")
+        if day != datetime.date.today().isoformat():
+            return 0
+        return int(used or 0)
+
+    def _show_schedule(self, city: str, date: datetime.date, times: dict[str, str]):
+        stale = date != datetime.date.today()
+        self._prayer_times = {} if stale else times
+        for name, time_str in times.items():
+            self._schedule_tab.set_prayer_time(name, time_str)
+        self._schedule_tab.set_stale(stale)
+
+        info = f"Jadwal {city}, {date:%d-%m-%Y}"
+        self._schedule_tab.set_info_text(f"{info} (memperbarui...)" if stale else info)
+
+    # ------------------------------------------------------------------
+    # Last known schedule ("city;YYYY-MM-DD;HH:MM,..." in PRAYER_NAMES order)
+    # ------------------------------------------------------------------
+
+    def _paint_last_schedule(self):
+        """Show the persisted schedule for the saved city before any fetch."""
+        snapshot = self._last_schedule()
+        if snapshot is not None and snapshot[0] == self._settings.value("city", "Jakarta"):
+            self._show_schedule(*snapshot)
+
+    def _last_schedule(self) -> tuple[str, datetime.date, dict[str, str]] | None:
         try:
-            self._prayer_times = self._prayer_service.fetch(city)
-            for name, time_str in self._prayer_times.items():
-                self._schedule_tab.set_prayer_time(name, time_str)
+            city, date, times = self._settings.value("last_schedule", "").split(";")
+            return (
+                city,
+                datetime.date.fromisoformat(date),
+                dict(zip(PRAYER_NAMES, times.split(","), strict=True)),
+            )
+        except ValueError:
+            return None
 
-            today = PrayerTimeService.today_formatted()
-            self._schedule_tab.set_info_text(f"Jadwal {city}, {today}")
-        except Exception as e:
-            self._schedule_tab.set_info_text("Gagal mengambil data")
-            print(e)
+    def _save_last_schedule(self, city: str, date: datetime.date, times: dict[str, str]):
+        packed = ",".join(times[name] for name in PRAYER_NAMES)
+        self._settings.setValue("last_schedule", f"{city};{date.isoformat()};{packed}")
 
     def _check_for_updates(self):
-        """Check for application updates from GitHub."""
-        result = self._update_service.check_for_updates()
+        """Check for application updates from GitHub in the background."""
+        threading.Thread(
+            target=lambda: self._update_checked.emit(self._update_service.check_for_updates()),
+            name="update-check",
+            daemon=True,
+        ).start()
+
+    def _on_update_checked(self, result: dict):
         if result['update_available']:
             self._schedule_tab.show_update_notification(
                 result['latest_version'],
                 result['download_url']
             )
+            # Opt-in: fetch the installer now so it is ready when the user is
+            if (self._settings.value("auto_download_updates", False, type=bool)
+                    and result['asset_url']):
+                self._download_update(result)
+
+    def _download_update(self, result: dict):
+        """Download and verify the release asset on a low-priority thread."""
+        def work():
+            _lower_thread_priority()
+            try:
+                sha256 = UpdateService.resolve_sha256(result)
+                if sha256 is None:
+                    # Never install something that can't be verified
+                    event_log.warning("update_download_skipped", result['asset_name'])
+                    return
+                path = UpdateDownloader().download(
+                    result['asset_url'], result['asset_name'], sha256
+                )
+            except Exception as e:
+                event_log.warning("update_download_failed", e)
+                return
+            self._update_downloaded.emit(result['latest_version'], path)
+
+        threading.Thread(target=work, name="update-download", daemon=True).start()
+
+    def _on_update_downloaded(self, version: str, path: str):
+        event_log.info("update_downloaded", version, path)
+        self._schedule_tab.show_update_notification(
+            version, QUrl.fromLocalFile(path).toString(), downloaded=True
+        )
+        self._tray.notify("Update Siap Dipasang", f"Adzanid v{version} sudah diunduh")
 
     # ------------------------------------------------------------------
     # Clock tick & adhan trigger
     # ------------------------------------------------------------------
 
     def _on_tick(self):
-        now = datetime.datetime.now()
+        now = self._clock.now()
         self._schedule_tab.update_clock(now.strftime("%H:%M:%S"))
 
-        # Detect day change and re-fetch prayer times
-        today = now.strftime("%d-%m-%Y")
-        if self._current_date is not None and self._current_date != today:
-            self._current_date = today
-            self._last_triggered_time = None
-            self._fetch_prayer_times()
-            return
-        self._current_date = today
-
-        current_short = now.strftime("%H:%M")
-        if self._last_triggered_time == current_short:
+    def _on_scheduler_wake(self):
+        result, delay_s = self._adhan.wake()
+        if result.day_changed:
+            self._refresh_schedule(catch_up=True)
+            self._refresh_monitored(catch_up=True)
             return
+        self._arm_scheduler(delay_s)
+        if result.due or result.missed:
+            self._on_events_changed()
+
+    def _update_countdown(self):
+        """Show the time to the next adhan in the tray, then sleep to the next minute."""
+        now = self._clock.now()
+        upcoming = self._adhan.scheduler.upcoming(1)
+        if upcoming:
+            event = upcoming[0]
+            minutes = math.ceil((event.when - now).total_seconds() / 60)
+            name = f"{event.name} ({event.city})" if event.city else event.name
+            self._tray.set_countdown(name, max(0, minutes))
+        else:
+            self._tray.set_countdown(None)
+        ms_into_minute = now.second * 1000 + now.microsecond // 1000
+        self._countdown_timer.start(max(50, 60_000 - ms_into_minute))
 
-        for prayer, p_time in self._prayer_times.items():
-            if current_short == p_time:
-                self._last_triggered_time = current_short
-                self._trigger_adhan(prayer)
+    def _arm_scheduler(self, delay_s: float):
+        """Sleep until the next prayer (capped so clock jumps are noticed)."""
+        self._scheduler_timer.start(max(50, int(delay_s * 1000)))
 
     def _trigger_adhan(self, prayer_name: str):
-        self._tray.notify(
-            "Waktu Sholat Tiba",
-            f"Saatnya sholat {prayer_name}",
+        self._adhan.trigger(prayer_name)
+
+    def _notify_reminder(self, event: ScheduledEvent):
+        if event.kind == REMINDER:
+            self._tray.notify(
+                "Pengingat Sholat", f"{event.lead} menit lagi waktu sholat {event.name}"
+            )
+        else:
+            self._tray.notify("Waktu Sholat", f"Waktu {event.name} tiba")
+
+    def _publish_prayer_event(self, prayer_name: str, city: str, audio_played: bool):
+        times = self._monitored_times.get(city, {}) if city else self._prayer_times
+        self._event_dispatcher.publish(PrayerEvent(
+            prayer=prayer_name,
+            city=city or self._settings_tab.selected_city,
+            scheduled=times.get(prayer_name, ""),
+            audio_played=audio_played,
+        ))
+
+    def _audio_path_for(self, prayer_name: str) -> str:
+        """Return the prayer's own audio file, or the default adhan."""
+        return self._settings.value(f"audio/{prayer_name}", "") or self._settings.value(
+            "mp3_path", DEFAULT_ADHAN_PATH
         )
-        # Skip audio if system Do Not Disturb / Focus Assist is active
-        if is_dnd_enabled():
-            return
-        self._play_adhan()
 
-    def _play_adhan(self):
-        mp3_path = self._settings.value("mp3_path", DEFAULT_ADHAN_PATH)
-        if self._audio_service.play(mp3_path):
+    def _preload_upcoming_audio(self):
+        """Keep players loaded for the next two prayers and the default adhan."""
+        paths = [
+            self._audio_path_for(event.name)
+            for event in self._adhan.scheduler.upcoming(2)
+        ]
+        paths.append(self._settings.value("mp3_path", DEFAULT_ADHAN_PATH))
+        self._audio_service.retain(list(dict.fromkeys(paths)))
+
+    def _play_adhan(self, prayer_name: str, city: str = "") -> bool:
+        if self._audio_service.play(self._audio_path_for(prayer_name)):
             self._update_audio_buttons(playing=True)
+            return True
+        return False
 
     def _on_test_audio(self):
         mp3_path = self._settings.value("mp3_path", DEFAULT_ADHAN_PATH)
@@ -284,6 +734,34 @@ class MainWindow(QMainWindow):
         self._settings_tab.btn_test_notification.setEnabled(True)
         self._settings_tab.btn_test_notification.setText("⏰ Test Notifikasi (10 detik)")
 
+    def handle_command(self, command: str):
+        """Handle a command forwarded by a second launch of the app."""
+        if command == "show":
+            self._show_window()
+        elif command == "dump-log":
+            self._dump_event_log()
+
+    def _dump_event_log(self):
+        """Write the in-memory event log to a file and say where it went."""
+        # Sink delivery counts and latency, so slow integrations show in the dump
+        for name, stats in self._event_dispatcher.stats().items():
+            event_log.info("sink_stats", name, *(f"{k}={v:g}" for k, v in stats.items()))
+        try:
+            path = event_log.dump()
+            if self._memory_monitor is not None:
+                with open(path.replace("dump-", "memory-"), "w", encoding="utf-8") as f:
+                    f.write(self._memory_monitor.report())
+        except OSError as e:
+            self._tray.notify("Gagal Menyimpan Log", str(e))
+            return
+        self._tray.notify("Log Diagnostik Disimpan", path)
+
+    def _flush_event_log(self):
+        try:
+            event_log.flush()
+        except OSError:
+            pass  # the records stay in memory for a dump
+
     def _show_window(self):
         """Restore and bring the window to the foreground."""
         self.showNormal()
@@ -3,9 +3,12 @@
 import webbrowser
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame
+from PyQt6.QtGui import QPalette
 from PyQt6.QtCore import Qt, pyqtSignal
 
 from app.constants import PRAYER_NAMES
+from app.services.theme_manager import styled_font, tint
+from app.ui.clock_widget import ClockWidget
 
 
 class ScheduleTab(QWidget):
@@ -16,6 +19,8 @@ class ScheduleTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._prayer_labels: dict[str, QLabel] = {}
+        self._prayer_rows: dict[str, QFrame] = {}
+        self._highlighted: str | None = None
         self._init_ui()
 
     def _init_ui(self):
@@ -23,35 +28,30 @@ class ScheduleTab(QWidget):
 
         # Update notification banner (hidden by default)
         self._update_widget = QFrame()
-        self._update_widget.setStyleSheet(
-            "background-color: #3498db; border-radius: 8px; padding: 10px;"
-        )
+        tint(self._update_widget, background="#3498db")
         self._update_widget.setVisible(False)
         
         update_layout = QHBoxLayout(self._update_widget)
         update_layout.setContentsMargins(10, 10, 10, 10)
         
         self._lbl_update = QLabel("")
-        self._lbl_update.setStyleSheet("color: white; font-size: 14px; font-weight: bold;")
+        self._lbl_update.setFont(styled_font(14, bold=True))
+        tint(self._lbl_update, foreground="#ffffff")
         self._lbl_update.setWordWrap(True)
         update_layout.addWidget(self._lbl_update, 1)
         
         self._btn_download_update = QPushButton("⬇ Download")
-        self._btn_download_update.setStyleSheet(
-            "background-color: #2ecc71; color: white; font-size: 14px; "
-            "font-weight: bold; padding: 8px 16px; border-radius: 5px;"
-        )
+        self._btn_download_update.setFont(styled_font(14, bold=True))
+        tint(self._btn_download_update, background="#2ecc71", foreground="#ffffff")
         self._btn_download_update.clicked.connect(self._on_download_update)
         update_layout.addWidget(self._btn_download_update)
         
         layout.addWidget(self._update_widget)
         layout.addSpacing(10)
 
-        # Large clock header
-        self.lbl_current_time = QLabel("00:00:00")
-        self.lbl_current_time.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.lbl_current_time.setStyleSheet("font-size: 40px; font-weight: bold;")
-        layout.addWidget(self.lbl_current_time)
+        # Large clock header (custom-painted: no relayout on every second)
+        self.clock = ClockWidget(40)
+        layout.addWidget(self.clock)
 
         self.lbl_info = QLabel("Menunggu jadwal...")
         self.lbl_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -59,26 +59,37 @@ class ScheduleTab(QWidget):
 
         layout.addSpacing(20)
 
-        # Prayer time rows
+        # Prayer time rows; the next prayer's row is highlighted through
+        # palette roles, which repaints the row without resizing anything
         for name in PRAYER_NAMES:
-            row = QHBoxLayout()
+            frame = QFrame()
+            frame.setAutoFillBackground(True)
+            row = QHBoxLayout(frame)
+            row.setContentsMargins(6, 2, 6, 2)
             lbl_name = QLabel(name)
             lbl_time = QLabel("--:--")
-            lbl_name.setStyleSheet("font-size: 16px;")
-            lbl_time.setStyleSheet("font-size: 16px; font-weight: bold;")
+            lbl_name.setFont(styled_font(16))
+            lbl_time.setFont(styled_font(16, bold=True))
 
             row.addWidget(lbl_name)
             row.addStretch()
             row.addWidget(lbl_time)
 
-            layout.addLayout(row)
+            layout.addWidget(frame)
             self._prayer_labels[name] = lbl_time
+            self._prayer_rows[name] = frame
+
+        # Next events across all monitored cities (hidden when only one city)
+        layout.addSpacing(10)
+        self.lbl_upcoming = QLabel("")
+        self.lbl_upcoming.setVisible(False)
+        layout.addWidget(self.lbl_upcoming)
 
         # Stop adzan button (hidden by default)
         self.btn_stop_adzan = QPushButton("⏹ Stop Adzan")
-        self.btn_stop_adzan.setStyleSheet(
-            "font-size: 16px; padding: 10px; background-color: #c0392b; color: white; border-radius: 6px;"
-        )
+        self.btn_stop_adzan.setFont(styled_font(16))
+        self.btn_stop_adzan.setMinimumHeight(44)
+        tint(self.btn_stop_adzan, background="#c0392b", foreground="#ffffff")
         self.btn_stop_adzan.setVisible(False)
         self.btn_stop_adzan.clicked.connect(self.stop_audio_requested.emit)
         layout.addWidget(self.btn_stop_adzan)
@@ -87,8 +98,8 @@ class ScheduleTab(QWidget):
         self.setLayout(layout)
 
     def update_clock(self, time_str: str):
-        """Update the large clock display."""
-        self.lbl_current_time.setText(time_str)
+        """Update the large clock display (only the changed digits repaint)."""
+        self.clock.set_time(time_str)
 
     def set_info_text(self, text: str):
         """Update the info label below the clock."""
@@ -96,12 +107,53 @@ class ScheduleTab(QWidget):
 
     def set_prayer_time(self, prayer_name: str, time_str: str):
         """Update the displayed time for a specific prayer."""
-        if prayer_name in self._prayer_labels:
-            self._prayer_labels[prayer_name].setText(time_str)
-
-    def show_update_notification(self, latest_version: str, download_url: str):
-        """Show the update notification banner."""
-        self._lbl_update.setText(f"🎉 Update tersedia: v{latest_version}")
+        label = self._prayer_labels.get(prayer_name)
+        # Revalidation usually returns the same times; skip the relayout
+        if label is not None and label.text() != time_str:
+            label.setText(time_str)
+
+    def highlight_prayer(self, prayer_name: str | None):
+        """Highlight the row of the next prayer (None clears it)."""
+        if prayer_name == self._highlighted:
+            return
+        for name in (self._highlighted, prayer_name):
+            frame = self._prayer_rows.get(name)
+            if frame is None:
+                continue
+            on = name == prayer_name
+            frame.setBackgroundRole(QPalette.ColorRole.Highlight if on else QPalette.ColorRole.Window)
+            for label in frame.findChildren(QLabel):
+                label.setForegroundRole(
+                    QPalette.ColorRole.HighlightedText if on else QPalette.ColorRole.WindowText
+                )
+        self._highlighted = prayer_name
+
+    def set_stale(self, stale: bool):
+        """Grey out the prayer times while they are from a previous day."""
+        for label in self._prayer_labels.values():
+            label.setEnabled(not stale)
+
+    def set_upcoming(self, rows: list[tuple[str, str, str]]):
+        """Show the next (time, prayer, city) events; an empty list hides the list."""
+        self.lbl_upcoming.setVisible(bool(rows))
+        text = "Berikutnya:\n" + "\n".join(
+            f"{time_str}  {prayer} \u2014 {city}" for time_str, prayer, city in rows
+        )
+        if self.lbl_upcoming.text() != text:
+            self.lbl_upcoming.setText(text)
+
+    def show_update_notification(self, latest_version: str, download_url: str,
+                                 downloaded: bool = False):
+        """Show the update notification banner.
+
+        With ``downloaded`` the URL points at the verified local installer.
+        """
+        if downloaded:
+            self._lbl_update.setText(f"🎉 Update v{latest_version} siap dipasang")
+            self._btn_download_update.setText("📦 Pasang")
+        else:
+            self._lbl_update.setText(f"🎉 Update tersedia: v{latest_version}")
+            self._btn_download_update.setText("⬇ Download")
         self._download_url = download_url
         self._update_widget.setVisible(True)
 
@@ -110,6 +162,6 @@ class ScheduleTab(QWidget):
         self._update_widget.setVisible(False)
 
     def _on_download_update(self):
-        """Open the download URL in the default browser."""
+        """Open the download URL (or the downloaded installer) with the default handler."""
         if hasattr(self, '_download_url'):
             webbrowser.open(self._download_url)
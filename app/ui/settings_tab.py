@@ -1,5 +1,7 @@
 """Settings tab for city selection, audio, theme, and startup options."""
 
+import os
+
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -10,10 +12,12 @@ from PyQt6.QtWidgets import (
     QCheckBox,
     QFileDialog,
     QSlider,
+    QListWidget,
+    QSpinBox,
 )
 from PyQt6.QtCore import pyqtSignal, Qt
 
-from app.constants import CITIES, DEFAULT_ADHAN_PATH
+from app.constants import ALERT_NAME_MAP, CITIES, DEFAULT_ADHAN_PATH, PRAYER_NAMES
 
 
 class SettingsTab(QWidget):
@@ -21,12 +25,17 @@ class SettingsTab(QWidget):
 
     # Signals emitted when the user changes a setting
     city_changed = pyqtSignal(str)
+    monitored_cities_changed = pyqtSignal(list)
     mp3_path_changed = pyqtSignal(str)
+    prayer_audio_changed = pyqtSignal(str, str)  # prayer, path ("" = default)
+    reminder_changed = pyqtSignal(str, int)  # prayer, minutes before (0 = off)
+    alert_toggled = pyqtSignal(str, bool)  # "Imsak" / "Terbit", enabled
     volume_changed = pyqtSignal(float)
     mute_toggled = pyqtSignal(bool)
     dark_mode_toggled = pyqtSignal(bool)
     startup_toggled = pyqtSignal(bool)
     minimize_to_tray_toggled = pyqtSignal(bool)
+    tray_badge_toggled = pyqtSignal(bool)
     test_audio_requested = pyqtSignal()
     stop_audio_requested = pyqtSignal()
     test_notification_requested = pyqtSignal()
@@ -45,6 +54,24 @@ class SettingsTab(QWidget):
         self.combo_city.currentTextChanged.connect(self.city_changed.emit)
         layout.addWidget(self.combo_city)
 
+        # Extra cities whose adhan times are also announced
+        layout.addWidget(QLabel("Pantau Kota Lain:"))
+        monitor_layout = QHBoxLayout()
+        self.combo_monitor = QComboBox()
+        self.combo_monitor.addItems(CITIES)
+        monitor_layout.addWidget(self.combo_monitor, 1)
+        btn_monitor_add = QPushButton("Tambah")
+        btn_monitor_add.clicked.connect(self._add_monitored_city)
+        monitor_layout.addWidget(btn_monitor_add)
+        btn_monitor_remove = QPushButton("Hapus")
+        btn_monitor_remove.clicked.connect(self._remove_monitored_city)
+        monitor_layout.addWidget(btn_monitor_remove)
+        layout.addLayout(monitor_layout)
+
+        self.list_monitored = QListWidget()
+        self.list_monitored.setMaximumHeight(70)
+        layout.addWidget(self.list_monitored)
+
         layout.addSpacing(10)
 
         # 2. MP3 file selection
@@ -59,6 +86,28 @@ class SettingsTab(QWidget):
         file_layout.addWidget(btn_browse)
         layout.addLayout(file_layout)
 
+        # Per-prayer audio (e.g. a different adhan for Subuh)
+        layout.addSpacing(5)
+        layout.addWidget(QLabel("Suara per Waktu Sholat:"))
+        prayer_audio_layout = QHBoxLayout()
+        self.combo_prayer_audio = QComboBox()
+        self.combo_prayer_audio.addItems(PRAYER_NAMES)
+        self.combo_prayer_audio.currentTextChanged.connect(self._show_prayer_audio)
+        prayer_audio_layout.addWidget(self.combo_prayer_audio)
+
+        self.lbl_prayer_audio = QLabel("Default")
+        prayer_audio_layout.addWidget(self.lbl_prayer_audio, 1)
+
+        btn_prayer_browse = QPushButton("Pilih...")
+        btn_prayer_browse.clicked.connect(self._browse_prayer_audio)
+        prayer_audio_layout.addWidget(btn_prayer_browse)
+
+        btn_prayer_reset = QPushButton("Default")
+        btn_prayer_reset.clicked.connect(lambda: self._set_prayer_audio(""))
+        prayer_audio_layout.addWidget(btn_prayer_reset)
+        layout.addLayout(prayer_audio_layout)
+        self._prayer_audio: dict[str, str] = {}
+
         # Test / Stop audio buttons
         layout.addSpacing(5)
         audio_btn_layout = QHBoxLayout()
@@ -100,10 +149,37 @@ class SettingsTab(QWidget):
         # Test notification button
         layout.addSpacing(5)
         self.btn_test_notification = QPushButton("⏰ Test Notifikasi (10 detik)")
-        self.btn_test_notification.setStyleSheet("padding: 8px;")
+        self.btn_test_notification.setMinimumHeight(36)
         self.btn_test_notification.clicked.connect(self.test_notification_requested.emit)
         layout.addWidget(self.btn_test_notification)
 
+        # Reminders before each prayer and notification-only alerts
+        layout.addSpacing(10)
+        layout.addWidget(QLabel("Pengingat Sebelum Sholat:"))
+        reminder_layout = QHBoxLayout()
+        self.combo_reminder = QComboBox()
+        self.combo_reminder.addItems(PRAYER_NAMES)
+        self.combo_reminder.currentTextChanged.connect(self._show_reminder)
+        reminder_layout.addWidget(self.combo_reminder)
+
+        self.spin_reminder = QSpinBox()
+        self.spin_reminder.setRange(0, 60)
+        self.spin_reminder.setSuffix(" menit")
+        self.spin_reminder.setSpecialValueText("Mati")
+        self.spin_reminder.valueChanged.connect(self._on_reminder_changed)
+        reminder_layout.addWidget(self.spin_reminder, 1)
+        layout.addLayout(reminder_layout)
+        self._reminders: dict[str, int] = {}
+
+        alert_layout = QHBoxLayout()
+        self.chk_alerts: dict[str, QCheckBox] = {}
+        for name in ALERT_NAME_MAP:
+            chk = QCheckBox(f"Notifikasi {name}")
+            chk.toggled.connect(lambda checked, n=name: self.alert_toggled.emit(n, checked))
+            alert_layout.addWidget(chk)
+            self.chk_alerts[name] = chk
+        layout.addLayout(alert_layout)
+
         layout.addSpacing(20)
 
         # 3. Feature checkboxes
@@ -115,6 +191,10 @@ class SettingsTab(QWidget):
         self.chk_tray.toggled.connect(self.minimize_to_tray_toggled.emit)
         layout.addWidget(self.chk_tray)
 
+        self.chk_tray_badge = QCheckBox("Hitung Mundur di Ikon Tray")
+        self.chk_tray_badge.toggled.connect(self.tray_badge_toggled.emit)
+        layout.addWidget(self.chk_tray_badge)
+
         self.chk_startup = QCheckBox("Run at Startup")
         self.chk_startup.toggled.connect(self.startup_toggled.emit)
         layout.addWidget(self.chk_startup)
@@ -131,6 +211,46 @@ class SettingsTab(QWidget):
             self.lbl_mp3_path.setText(file)
             self.mp3_path_changed.emit(file)
 
+    def _add_monitored_city(self):
+        city = self.combo_monitor.currentText()
+        if city not in self.monitored_cities:
+            self.list_monitored.addItem(city)
+            self.monitored_cities_changed.emit(self.monitored_cities)
+
+    def _remove_monitored_city(self):
+        row = self.list_monitored.currentRow()
+        if row >= 0:
+            self.list_monitored.takeItem(row)
+            self.monitored_cities_changed.emit(self.monitored_cities)
+
+    def _browse_prayer_audio(self):
+        """Pick an audio file for the prayer selected in the combo box."""
+        file, _ = QFileDialog.getOpenFileName(
+            self, "Pilih File Suara", "", "Audio Files (*.mp3 *.wav)"
+        )
+        if file:
+            self._set_prayer_audio(file)
+
+    def _set_prayer_audio(self, path: str):
+        prayer = self.combo_prayer_audio.currentText()
+        self._prayer_audio[prayer] = path
+        self._show_prayer_audio(prayer)
+        self.prayer_audio_changed.emit(prayer, path)
+
+    def _show_prayer_audio(self, prayer: str):
+        path = self._prayer_audio.get(prayer, "")
+        self.lbl_prayer_audio.setText(os.path.basename(path) if path else "Default")
+
+    def _show_reminder(self, prayer: str):
+        self.spin_reminder.blockSignals(True)
+        self.spin_reminder.setValue(self._reminders.get(prayer, 0))
+        self.spin_reminder.blockSignals(False)
+
+    def _on_reminder_changed(self, minutes: int):
+        prayer = self.combo_reminder.currentText()
+        self._reminders[prayer] = minutes
+        self.reminder_changed.emit(prayer, minutes)
+
     def _on_volume_changed(self, value: int):
         """Handle volume slider changes."""
         self.lbl_volume.setText(f"{value}%")
@@ -148,13 +268,38 @@ class SettingsTab(QWidget):
         return self.combo_city.currentText()
 
     def set_city(self, city: str):
+        """Select ``city`` without emitting ``city_changed`` (not a user change)."""
         idx = self.combo_city.findText(city)
         if idx >= 0:
+            self.combo_city.blockSignals(True)
             self.combo_city.setCurrentIndex(idx)
+            self.combo_city.blockSignals(False)
+
+    @property
+    def monitored_cities(self) -> list[str]:
+        return [self.list_monitored.item(i).text() for i in range(self.list_monitored.count())]
+
+    def set_monitored_cities(self, cities: list[str]):
+        self.list_monitored.clear()
+        self.list_monitored.addItems(cities)
 
     def set_mp3_path_label(self, path: str):
         self.lbl_mp3_path.setText(path)
 
+    def set_prayer_audio_paths(self, paths: dict[str, str]):
+        self._prayer_audio = dict(paths)
+        self._show_prayer_audio(self.combo_prayer_audio.currentText())
+
+    def set_reminders(self, minutes: dict[str, int]):
+        self._reminders = dict(minutes)
+        self._show_reminder(self.combo_reminder.currentText())
+
+    def set_alerts(self, enabled: dict[str, bool]):
+        for name, chk in self.chk_alerts.items():
+            chk.blockSignals(True)
+            chk.setChecked(enabled.get(name, False))
+            chk.blockSignals(False)
+
     @property
     def minimize_to_tray(self) -> bool:
         return self.chk_tray.isChecked()
@@ -3,20 +3,42 @@
 import os
 
 from PyQt6.QtWidgets import QSystemTrayIcon, QMenu, QApplication, QStyle
-from PyQt6.QtGui import QIcon, QAction
-from PyQt6.QtCore import pyqtSignal, QObject
+from PyQt6.QtGui import QIcon, QAction, QColor, QPainter, QPixmap
+from PyQt6.QtCore import pyqtSignal, QObject, QRectF, Qt
 
-from app.constants import ICON_PATH
+from app.constants import APP_TITLE, ICON_PATH
+from app.services.theme_manager import ACCENT, styled_font
+
+
+def countdown_text(minutes: int) -> str:
+    """Format minutes until the next prayer as "12m" or "1j 05m"."""
+    if minutes < 60:
+        return f"{minutes}m"
+    return f"{minutes // 60}j {minutes % 60:02d}m"
+
+
+def badge_text(minutes: int) -> str:
+    """Shortest form for the icon badge: minutes below an hour, else hours."""
+    return str(minutes) if minutes < 60 else f"{minutes // 60}j"
 
 
 class SystemTrayManager(QObject):
     """Manages the system tray icon, context menu, and notifications."""
 
     show_requested = pyqtSignal()
+    dump_log_requested = pyqtSignal()
+
+    BADGE_ICON_SIZE = 64
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._tray_icon = QSystemTrayIcon(parent)
+        self._base_icon = QIcon()
+        # Badge text → composed icon; at most ~85 values (0–59 minutes, hours)
+        self._badge_icons: dict[str, QIcon] = {}
+        self._tooltip = ""
+        self._badge = ""
+        self._badge_enabled = False
         self._setup_icon(parent)
         self._setup_menu(parent)
 
@@ -30,7 +52,9 @@ class SystemTrayManager(QObject):
             icon = QIcon(ICON_PATH)
         else:
             icon = parent.style().standardIcon(QStyle.StandardPixmap.SP_ComputerIcon)
+        self._base_icon = icon
         self._tray_icon.setIcon(icon)
+        self._tray_icon.setToolTip(APP_TITLE)
 
     def _setup_menu(self, parent):
         """Build the right-click context menu."""
@@ -39,10 +63,15 @@ class SystemTrayManager(QObject):
         show_action = QAction("Tampilkan", parent)
         show_action.triggered.connect(self.show_requested.emit)
 
+        dump_log_action = QAction("Simpan Log Diagnostik", parent)
+        dump_log_action.triggered.connect(self.dump_log_requested.emit)
+
         quit_action = QAction("Keluar", parent)
         quit_action.triggered.connect(QApplication.instance().quit)
 
         menu.addAction(show_action)
+        menu.addAction(dump_log_action)
+        menu.addSeparator()
         menu.addAction(quit_action)
         self._tray_icon.setContextMenu(menu)
 
@@ -50,6 +79,56 @@ class SystemTrayManager(QObject):
         if reason == QSystemTrayIcon.ActivationReason.DoubleClick:
             self.show_requested.emit()
 
+    def set_badge_enabled(self, enabled: bool):
+        """Show or hide the countdown badge on the tray icon."""
+        self._badge_enabled = enabled
+        if not enabled and self._badge:
+            self._badge = ""
+            self._tray_icon.setIcon(self._base_icon)
+
+    def set_countdown(self, prayer: str | None, minutes: int = 0):
+        """Show the time left until ``prayer`` (None clears it).
+
+        Only touches the tray when the displayed text changes, i.e. at
+        most once a minute; badge icons are composed once per value.
+        """
+        if prayer is None:
+            tooltip, badge = APP_TITLE, ""
+        else:
+            tooltip = f"{APP_TITLE}\n{prayer} dalam {countdown_text(minutes)}"
+            badge = badge_text(minutes) if self._badge_enabled else ""
+
+        if tooltip != self._tooltip:
+            self._tooltip = tooltip
+            self._tray_icon.setToolTip(tooltip)
+        if badge != self._badge:
+            self._badge = badge
+            self._tray_icon.setIcon(self._badge_icon(badge) if badge else self._base_icon)
+
+    def _badge_icon(self, text: str) -> QIcon:
+        icon = self._badge_icons.get(text)
+        if icon is None:
+            icon = self._badge_icons[text] = QIcon(self._render_badge(text))
+        return icon
+
+    def _render_badge(self, text: str) -> QPixmap:
+        """Compose the base icon with ``text`` in a pill along the bottom."""
+        size = self.BADGE_ICON_SIZE
+        pixmap = self._base_icon.pixmap(size, size)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(styled_font(size * 9 // 20, bold=True))
+        width = min(size, painter.fontMetrics().horizontalAdvance(text) + size // 6)
+        height = size * 11 // 20
+        rect = QRectF(size - width, size - height, width, height)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(ACCENT))
+        painter.drawRoundedRect(rect, height / 3, height / 3)
+        painter.setPen(QColor("white"))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
+        return pixmap
+
     def notify(self, title: str, message: str, duration_ms: int = 5000):
         """Show a balloon notification from the tray icon."""
         self._tray_icon.showMessage(
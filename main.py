@@ -2,15 +2,61 @@
 
 import sys
 
-from PyQt6.QtWidgets import QApplication
-
-from app.ui.main_window import MainWindow
+from app.services import profiler
+from app.services.event_log import EventLog, event_log
+from app.services.single_instance import SingleInstance
 
 
 def main():
+    # --dump-log asks the running instance to write its in-memory event log
+    command = "dump-log" if "--dump-log" in sys.argv[1:] else "show"
+
+    # Hand off to an already-running instance before any widget exists
+    instance = SingleInstance()
+    if not instance.acquire():
+        if not instance.send(command):
+            print("Adzanid sudah berjalan tetapi tidak merespons.")
+        elif command == "dump-log":
+            print(f"Log disimpan di {EventLog.log_dir()}")
+        sys.exit(0)
+    if command == "dump-log":
+        print(f"Adzanid tidak berjalan. Log terakhir: {event_log.file_path()}")
+        sys.exit(0)
+
+    # --profile[=MINUTES] / ADZANID_PROFILE: profile startup, then sample steady state
+    profile_minutes = profiler.requested(sys.argv[1:])
+    startup_profile = None
+    if profile_minutes is not None:
+        startup_profile = profiler.StartupProfiler()
+        startup_profile.start()
+
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    from app.ui.main_window import MainWindow
+
     app = QApplication(sys.argv)
+    # Listen before building the window so a quick second launch isn't
+    # refused; its command is read once the event loop starts below
+    instance.listen()
     window = MainWindow()
+    instance.message_received.connect(window.handle_command)
     window.show()
+
+    if startup_profile is not None:
+        app.processEvents()  # include the first paint
+        event_log.info("profile_written", startup_profile.stop())
+    if profile_minutes:
+        sampler = profiler.SamplingProfiler()
+        sampler.start()
+
+        def stop_sampler():
+            if not sampler.stopped:
+                event_log.info("profile_written", sampler.stop())
+
+        QTimer.singleShot(profile_minutes * 60 * 1000, stop_sampler)
+        app.aboutToQuit.connect(stop_sampler)
+
     sys.exit(app.exec())
 
 
@@ -0,0 +1,96 @@
+"""
+Benchmark of the per-second clock update in the schedule tab.
+
+Shows a ScheduleTab and replays one-second clock ticks, processing events
+after each one as the real timer would. Reports the time per tick, the
+number of layout passes and the repainted area. ``--legacy`` puts back a
+QLabel updated with ``setText`` (the old clock) for comparison, and
+``--dark`` runs with the dark palette.
+
+Usage: QT_QPA_PLATFORM=offscreen python -m scripts.benchmark_clock
+       [--ticks 600] [--legacy] [--dark]
+"""
+
+import argparse
+import datetime
+import statistics
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication, QLabel
+from PyQt6.QtCore import QEvent, QObject, Qt
+
+from app.services.theme_manager import ThemeManager, styled_font
+from app.ui.schedule_tab import ScheduleTab
+
+
+class EventCounter(QObject):
+    """Counts layout requests and repainted pixels across the window."""
+
+    def __init__(self):
+        super().__init__()
+        self.layouts = 0
+        self.paints = 0
+        self.painted_px = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.LayoutRequest:
+            self.layouts += 1
+        elif event.type() == QEvent.Type.Paint:
+            self.paints += 1
+            rect = event.rect()
+            self.painted_px += rect.width() * rect.height()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--legacy", action="store_true",
+                        help="update a QLabel with setText every tick")
+    parser.add_argument("--dark", action="store_true")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    theme = ThemeManager()
+    theme.is_dark = args.dark
+    theme.apply()
+
+    tab = ScheduleTab()
+    if args.legacy:
+        label = QLabel("00:00:00")
+        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        label.setFont(styled_font(40, bold=True))
+        tab.layout().replaceWidget(tab.clock, label)
+        tab.clock.hide()
+        update = label.setText
+    else:
+        update = tab.update_clock
+    tab.resize(400, 550)
+    tab.show()
+    app.processEvents()
+
+    counter = EventCounter()
+    app.installEventFilter(counter)
+    now = datetime.datetime(2026, 1, 1, 11, 58, 0)
+    timings = []
+    for _ in range(args.ticks):
+        now += datetime.timedelta(seconds=1)
+        started = time.perf_counter()
+        update(now.strftime("%H:%M:%S"))
+        app.processEvents()
+        timings.append((time.perf_counter() - started) * 1000)
+    app.removeEventFilter(counter)
+
+    timings.sort()
+    print(f"Mode: {'QLabel.setText' if args.legacy else 'ClockWidget'}"
+          f"{' (dark)' if args.dark else ''}")
+    print(f"Tick ({len(timings)}x): median {statistics.median(timings):.3f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95) - 1]:.3f} ms, max {timings[-1]:.3f} ms")
+    print(f"Layout requests: {counter.layouts / args.ticks:.2f} per tick")
+    print(f"Paint events: {counter.paints / args.ticks:.2f} per tick, "
+          f"{counter.painted_px / args.ticks:.0f} px per tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark of theme switching and first-show polish time.
+
+Builds the three tabs of the main window (without services or network)
+and measures how long the first show takes until all widgets are
+polished, then how long each dark/light toggle takes until the event
+queue is drained. ``--legacy`` switches themes the old way, by replacing
+a full application stylesheet, for comparison.
+
+Usage: QT_QPA_PLATFORM=offscreen python -m scripts.benchmark_theme
+       [--toggles 50] [--legacy]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication, QTabWidget
+
+from app.services.theme_manager import STYLESHEET, THEME_COLORS, ThemeManager
+from app.ui.about_tab import AboutTab
+from app.ui.schedule_tab import ScheduleTab
+from app.ui.settings_tab import SettingsTab
+
+
+def legacy_stylesheet(colors: dict[str, str]) -> str:
+    """Approximate the per-theme stylesheet that used to be swapped on toggle."""
+    return STYLESHEET + f"""
+    QMainWindow, QWidget {{ background-color: {colors['window']}; color: {colors['text']}; }}
+    QTabWidget::pane {{ border: 1px solid {colors['mid']}; top: -1px; }}
+    QTabBar::tab {{ background: {colors['base']}; color: {colors['text']};
+                    border: 1px solid {colors['mid']}; }}
+    QCheckBox {{ color: {colors['text']}; background: transparent; }}
+    QCheckBox::indicator {{ width: 15px; height: 15px; border: 1px solid {colors['mid']};
+                           background: {colors['base']}; }}
+    QComboBox, QPushButton, QLineEdit {{
+        background-color: {colors['button']}; color: {colors['text']};
+        border: 1px solid {colors['mid']}; padding: 6px; border-radius: 4px;
+    }}
+    """
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--toggles", type=int, default=50)
+    parser.add_argument("--legacy", action="store_true",
+                        help="toggle by replacing the application stylesheet")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    theme = ThemeManager()
+
+    def toggle(dark: bool):
+        if args.legacy:
+            app.setStyleSheet(legacy_stylesheet(THEME_COLORS["dark" if dark else "light"]))
+        else:
+            theme.is_dark = dark
+            theme.apply()
+
+    toggle(False)
+    started = time.perf_counter()
+    window = QTabWidget()
+    window.addTab(ScheduleTab(), "Jadwal")
+    window.addTab(SettingsTab(), "Pengaturan")
+    window.addTab(AboutTab(), "Tentang")
+    window.resize(400, 550)
+    window.show()
+    app.processEvents()
+    first_show_ms = (time.perf_counter() - started) * 1000
+
+    timings = []
+    for i in range(args.toggles):
+        started = time.perf_counter()
+        toggle(i % 2 == 0)
+        app.processEvents()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    mode = "stylesheet" if args.legacy else "palette"
+    print(f"Mode: {mode}")
+    print(f"First show + polish: {first_show_ms:.1f} ms")
+    print(f"Toggle ({len(timings)}x): median {statistics.median(timings):.2f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms, max {timings[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
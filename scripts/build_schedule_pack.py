@@ -0,0 +1,52 @@
+"""
+Build the offline schedule pack and, optionally, a delta against an older one.
+
+Usage: python -m scripts.build_schedule_pack --year 2026 [--out assets/schedule_pack_2026.adzt]
+       python -m scripts.build_schedule_pack --year 2026 --delta-from old.adzt \\
+           --base-revision 3 --revision 4 --delta-out 3.delta
+"""
+
+import argparse
+import hashlib
+import os
+import zlib
+
+from app.services.prayer_time_service import PrayerTimeService
+from app.services.schedule_pack import (
+    BUNDLED_PACK_DIR,
+    build_pack,
+    diff_packs,
+    encode_delta,
+    pack_filename,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--out", help="default: assets/schedule_pack_<year>.adzt")
+    parser.add_argument("--delta-from", help="older pack to diff against")
+    parser.add_argument("--base-revision", type=int, default=0)
+    parser.add_argument("--revision", type=int, default=1)
+    parser.add_argument("--delta-out", help="default: <base-revision>.delta")
+    args = parser.parse_args()
+
+    out = args.out or os.path.join(BUNDLED_PACK_DIR, pack_filename(args.year))
+    build_pack(out, args.year, PrayerTimeService.METHOD)
+    with open(out, "rb") as f:
+        raw = f.read()
+    print(f"✅ {out}: {len(raw) / 1024:.0f} KB "
+          f"({len(zlib.compress(raw, 9)) / 1024:.0f} KB terkompresi)")
+
+    if args.delta_from:
+        changes = diff_packs(args.delta_from, out)
+        delta = encode_delta(args.year, args.base_revision, args.revision, changes)
+        delta_out = args.delta_out or f"{args.base_revision}.delta"
+        with open(delta_out, "wb") as f:
+            f.write(delta)
+        print(f"✅ {delta_out}: {len(changes)} perubahan, {len(delta)} byte, "
+              f"sha256 {hashlib.sha256(delta).hexdigest()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Accuracy regression check of the offline backends against recorded API results.
+
+Compares what each fast path returns with Aladhan's own timings, recorded
+once per year for every city in CITY_COORDINATES (untuned, method 20),
+and reports the per-prayer max, mean and p99 deviation in minutes. Runs
+fully offline once the fixture exists; ``--record`` writes it to
+``scripts/fixtures/`` (12 requests per city), where it is committed.
+
+Exits 1 if any deviation exceeds ``--max-error`` (default 1 minute) or
+the fixture doesn't cover every city, and 2 if there is no fixture.
+
+Backends:
+    local    prayer_calculator.compute_minutes
+    pack     the offline schedule pack (user copy or bundled, else built)
+    lattice  PrayerTimeLattice interpolation (every 7th day; planes are slow)
+
+Usage: python -m scripts.check_accuracy --record --year 2026   (network, once)
+       python -m scripts.check_accuracy --year 2026 [--backend local --backend pack]
+       [--max-error 1]
+"""
+
+import argparse
+import datetime
+import gzip
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from array import array
+
+import requests
+
+from app.constants import CITY_COORDINATES
+from app.services.prayer_calculator import TIME_KEYS, compute_minutes
+from app.services.prayer_lattice import PrayerTimeLattice
+from app.services.prayer_time_service import PrayerTimeService
+from app.services.schedule_pack import SchedulePack, build_pack
+from app.services.schedule_table import ScheduleTable
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+BACKENDS = ("local", "pack", "lattice")
+LATTICE_DAY_STRIDE = 7
+METHOD = PrayerTimeService.METHOD
+
+
+def fixture_path(year: int) -> str:
+    return os.path.join(FIXTURE_DIR, f"aladhan_{year}_m{METHOD}.json.gz")
+
+
+def days_of(year: int) -> list[datetime.date]:
+    start = datetime.date(year, 1, 1)
+    count = (datetime.date(year + 1, 1, 1) - start).days
+    return [start + datetime.timedelta(days=i) for i in range(count)]
+
+
+# ------------------------------------------------------------------
+# Fixtures: {"year", "method", "keys", "cities": {city: [[minutes]*8]*days}}
+# ------------------------------------------------------------------
+
+def record(year: int) -> None:
+    """Download a year of untuned timings for every city (12 requests per city)."""
+    selected = sorted(CITY_COORDINATES)
+    cities = {}
+    for n, city in enumerate(selected, 1):
+        lat, lng = CITY_COORDINATES[city]
+        rows = []
+        for month in range(1, 13):
+            resp = requests.get(
+                f"{PrayerTimeService.API_BASE_URL}/calendar/{year}/{month}",
+                params={"latitude": lat, "longitude": lng, "method": METHOD},
+                timeout=30,
+            )
+            resp.raise_for_status()
+            for day in resp.json()["data"]:
+                timings = day["timings"]
+                rows.append([PrayerTimeService._to_minutes(timings[key]) for key in TIME_KEYS])
+        cities[city] = rows
+        print(f"\r{n}/{len(selected)} {city:<30}", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    data = {"year": year, "method": METHOD, "keys": TIME_KEYS, "cities": cities}
+    with gzip.open(fixture_path(year), "wt", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    print(f"✅ {fixture_path(year)}")
+
+
+def load_fixture(year: int) -> dict[str, list[list[int]]]:
+    with gzip.open(fixture_path(year), "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if tuple(data["keys"]) != TIME_KEYS or data["method"] != METHOD:
+        raise ValueError("fixture was recorded with different keys or method")
+    return data["cities"]
+
+
+# ------------------------------------------------------------------
+# Backends: each yields (city, day index, [minutes]*8), untuned
+# ------------------------------------------------------------------
+
+def backend_local(year: int, cities):
+    for city in cities:
+        lat, lng = CITY_COORDINATES[city]
+        for d, date in enumerate(days_of(year)):
+            minutes = compute_minutes(date, lat, lng, "", METHOD)
+            yield city, d, [minutes[key] for key in TIME_KEYS]
+
+
+def backend_pack(year: int, cities):
+    path = SchedulePack(METHOD).path(year)
+    tmp_dir = None
+    if not os.path.exists(path):
+        tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp_dir.name, "pack.adzt")
+        build_pack(path, year, METHOD)
+    table = ScheduleTable(path)
+    try:
+        for city in cities:
+            for d, date in enumerate(days_of(year)):
+                minutes = table.minutes(city, date)
+                yield city, d, [minutes[key] for key in TIME_KEYS]
+    finally:
+        table.close()
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+
+def backend_lattice(year: int, cities):
+    lattice = PrayerTimeLattice(METHOD, "", max_days=1)
+    lats = [CITY_COORDINATES[city][0] for city in cities]
+    lngs = [CITY_COORDINATES[city][1] for city in cities]
+    for d, date in enumerate(days_of(year)):
+        if d % LATTICE_DAY_STRIDE:
+            continue
+        columns = lattice.minutes_many(date, lats, lngs)
+        for n, city in enumerate(cities):
+            yield city, d, [columns[key][n] for key in TIME_KEYS]
+
+
+# ------------------------------------------------------------------
+# Comparison
+# ------------------------------------------------------------------
+
+def compare(rows, fixture) -> dict[str, array]:
+    """Collect signed deviations (backend − API, minutes) per prayer."""
+    diffs = {key: array("h") for key in TIME_KEYS}
+    columns = [diffs[key] for key in TIME_KEYS]
+    for city, d, values in rows:
+        expected = fixture[city][d]
+        for column, got, want in zip(columns, values, expected):
+            # Wrap so 23:59 vs 00:00 counts as one minute
+            column.append((got - want + 720) % 1440 - 720)
+    return diffs
+
+
+def summarize(diffs: array) -> tuple[int, float, int]:
+    """Return (max abs, mean abs, p99 abs) of one prayer's deviations."""
+    if not diffs:
+        return 0, 0.0, 0
+    magnitudes = sorted(map(abs, diffs))
+    p99 = magnitudes[min(len(magnitudes) - 1, math.ceil(len(magnitudes) * 0.99) - 1)]
+    return magnitudes[-1], sum(magnitudes) / len(magnitudes), p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--year", type=int, default=datetime.date.today().year)
+    parser.add_argument("--record", action="store_true",
+                        help="download the fixture from Aladhan (needs network)")
+    parser.add_argument("--backend", action="append", choices=BACKENDS,
+                        help="limit to these backends (default: all)")
+    parser.add_argument("--max-error", type=int, default=1,
+                        help="fail if any deviation exceeds this many minutes")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.year)
+        return
+
+    try:
+        fixture = load_fixture(args.year)
+    except FileNotFoundError:
+        print(f"❌ Fixture {fixture_path(args.year)} belum ada; "
+              f"jalankan dulu dengan --record (perlu jaringan)")
+        sys.exit(2)
+    cities = sorted(city for city in CITY_COORDINATES if city in fixture)
+
+    failed = False
+    missing = sorted(set(CITY_COORDINATES) - set(fixture))
+    if missing:
+        print(f"❌ Fixture tidak memuat {len(missing)} kota: {', '.join(missing[:5])}"
+              f"{' …' if len(missing) > 5 else ''}; rekam ulang dengan --record")
+        failed = True
+    for name in args.backend or BACKENDS:
+        started = time.perf_counter()
+        if name == "local":
+            rows = backend_local(args.year, cities)
+        elif name == "pack":
+            rows = backend_pack(args.year, cities)
+        else:
+            rows = backend_lattice(args.year, cities)
+        diffs = compare(rows, fixture)
+        elapsed = time.perf_counter() - started
+
+        count = len(diffs[TIME_KEYS[0]])
+        print(f"\n{name}: {count} kota-hari dalam {elapsed:.2f} s")
+        print(f"  {'waktu':<8} {'max':>4} {'mean':>7} {'p99':>4}  (menit)")
+        for key in TIME_KEYS:
+            worst, mean, p99 = summarize(diffs[key])
+            mark = "❌" if worst > args.max_error else "  "
+            failed |= worst > args.max_error
+            print(f"{mark}{key:<8} {worst:>4} {mean:>7.3f} {p99:>4}")
+
+    if failed:
+        print(f"\n❌ Gagal: fixture tidak lengkap atau deviasi lebih dari {args.max_error} menit")
+        sys.exit(1)
+    print(f"\n✅ Semua backend dalam {args.max_error} menit dari API")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Generate Ramadan imsakiyah for every city, offline, into one CSV.
+
+Usage: python -m scripts.generate_imsakiyah --year 2026 [--adjust -1] [--out imsakiyah.csv]
+       python -m scripts.generate_imsakiyah --hijri-year 1447 --city Jakarta --city Bandung
+"""
+
+import argparse
+import os
+import time
+
+from app.constants import CITY_COORDINATES
+from app.services import hijri
+from app.services.imsakiyah import generate_ramadan, write_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--year", type=int, help="Gregorian year Ramadan starts in")
+    group.add_argument("--hijri-year", type=int)
+    parser.add_argument("--adjust", type=int, default=0,
+                        help="days to shift the tabular Hijri calendar (official start)")
+    parser.add_argument("--city", action="append", choices=sorted(CITY_COORDINATES),
+                        metavar="CITY", help="limit to these cities (default: all)")
+    parser.add_argument("--out", help="default: imsakiyah_<hijri year>.csv")
+    args = parser.parse_args()
+
+    if args.hijri_year:
+        hijri_years = [args.hijri_year]
+    else:
+        hijri_years = [hijri.to_hijri(start, args.adjust)[0]
+                       for start, _ in hijri.ramadan_in(args.year, args.adjust)]
+
+    for year in hijri_years:
+        started = time.perf_counter()
+        start, tables = generate_ramadan(year, args.adjust, args.city)
+        elapsed = time.perf_counter() - started
+        out = args.out or f"imsakiyah_{year}.csv"
+        if args.out and len(hijri_years) > 1:
+            root, ext = os.path.splitext(args.out)
+            out = f"{root}_{year}{ext}"
+        write_csv(out, start, tables, args.adjust)
+        days = len(next(iter(tables.values())))
+        print(f"✅ {out}: Ramadan {year} H mulai {start:%d-%m-%Y}, {days} hari, "
+              f"{len(tables)} kota dalam {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
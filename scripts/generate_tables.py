@@ -0,0 +1,122 @@
+"""
+Generate multi-year prayer time tables for a large gazetteer in parallel.
+
+Every (location, year) pair is computed by the local engine in a worker
+process and written as its own shard file; finished shards are skipped on
+the next run, so an interrupted job resumes where it stopped. When all
+shards exist they are merged into a single indexed table file readable by
+app.services.schedule_table.ScheduleTable.
+
+The gazetteer is a CSV with columns name,lat,lng[,utc_offset]. Without one,
+the built-in CITY_COORDINATES are used.
+
+Usage: python -m scripts.generate_tables --years 2026 2027 --out tables.adzt
+       [--gazetteer lokasi.csv] [--jobs N]
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.constants import CITY_COORDINATES
+from app.services.prayer_time_service import PrayerTimeService
+from app.services.schedule_table import build_entry, read_entries, stored_name, write_table
+
+Location = tuple[str, float, float, float | None]
+
+
+def load_gazetteer(path: str | None) -> list[Location]:
+    """Read (name, lat, lng, utc_offset) rows from a CSV file."""
+    if path is None:
+        return [(name, lat, lng, None)
+                for name, (lat, lng) in sorted(CITY_COORDINATES.items())]
+
+    locations = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            offset = row.get("utc_offset")
+            locations.append((
+                row["name"], float(row["lat"]), float(row["lng"]),
+                float(offset) if offset else None,
+            ))
+    return locations
+
+
+def shard_path(shard_dir: str, location: Location, year: int) -> str:
+    """Stable shard file name, independent of the gazetteer's row order."""
+    digest = hashlib.sha1(repr(location).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(shard_dir, f"{digest}_{year}.adzt")
+
+
+def _generate_shard(location: Location, year: int, path: str,
+                    method: int, tune: str) -> str:
+    name, lat, lng, utc_offset = location
+    entry = build_entry(name, lat, lng, year, method, tune, utc_offset)
+    write_table(path, [entry], method, tune)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--years", type=int, nargs="+", required=True)
+    parser.add_argument("--out", required=True, help="merged table file")
+    parser.add_argument("--gazetteer", help="CSV with name,lat,lng[,utc_offset]")
+    parser.add_argument("--shard-dir", help="default: <out>.shards")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    method, tune = PrayerTimeService.METHOD, PrayerTimeService.TUNE
+    locations = load_gazetteer(args.gazetteer)
+    # Names are stored in 48 bytes; two rows that collide there can't both be read
+    names: dict[str, str] = {}
+    for name, *_ in locations:
+        key = stored_name(name)
+        if key in names:
+            parser.error(f"nama lokasi ganda (48 byte pertama sama): {names[key]!r} dan {name!r}")
+        names[key] = name
+    shard_dir = args.shard_dir or f"{args.out}.shards"
+    os.makedirs(shard_dir, exist_ok=True)
+
+    work = [
+        (location, year, shard_path(shard_dir, location, year))
+        for location in locations
+        for year in args.years
+    ]
+    pending = [item for item in work if not os.path.exists(item[2])]
+    total = len(work)
+    done = total - len(pending)
+    print(f"{total} shard ({done} sudah ada), {args.jobs} proses")
+
+    started = time.perf_counter()
+    last_report = 0.0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [
+            pool.submit(_generate_shard, location, year, path, method, tune)
+            for location, year, path in pending
+        ]
+        for future in as_completed(futures):
+            future.result()
+            done += 1
+            elapsed = time.perf_counter() - started
+            if elapsed - last_report >= 1.0 or done == total:
+                last_report = elapsed
+                rate = (done - (total - len(pending))) / elapsed if elapsed else 0
+                eta = (total - done) / rate if rate else 0
+                print(f"\r{done}/{total} shard  {rate:.0f}/s  ETA {eta:.0f}s",
+                      end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+
+    entries = []
+    for _, _, path in work:
+        entries += read_entries(path)
+    write_table(args.out, entries, method, tune)
+    size_kb = os.path.getsize(args.out) / 1024
+    print(f"✅ {len(entries)} lokasi-tahun → {args.out} ({size_kb:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
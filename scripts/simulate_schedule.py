@@ -0,0 +1,202 @@
+"""
+Time-warp simulation of the adhan scheduler.
+
+Replays a full year of days for every city on a simulated clock, using the
+same AdhanController as MainWindow and locally computed schedules, and
+checks that every prayer fires exactly once, that day rollovers reload the
+schedule, and that Do Not Disturb suppresses audio but not notifications.
+Each prayer also gets a reminder ``--reminder`` minutes earlier, which must
+fire exactly once, on time, and never play audio.
+
+Usage: python -m scripts.simulate_schedule [--year 2026] [--city Jakarta]
+       [--dnd-every 7] [--suspend-every 0] [--suspend-hours 6] [--jobs N]
+       [--reminder 10]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from app.constants import CITIES
+from app.services.clock import SimulatedClock
+from app.services.prayer_time_service import PrayerTimeService
+from app.services.scheduler_service import ADHAN, AdhanController, PrayerScheduler
+
+
+def simulate_city(
+    city: str,
+    year: int,
+    dnd_every: int = 7,
+    suspend_every: int = 0,
+    suspend_hours: float = 6.0,
+    seed: int = 0,
+    reminder: int = 10,
+) -> list[str]:
+    """Simulate one city for a year and return a list of failures."""
+    service = PrayerTimeService()
+    start = datetime.datetime(year, 1, 1)
+    end = datetime.datetime(year + 1, 1, 1)
+    clock = SimulatedClock(start)
+    rng = random.Random(f"{seed}:{city}")
+
+    fired: dict[tuple[datetime.date, str], int] = {}
+    missed: dict[tuple[datetime.date, str], int] = {}
+    reminded: dict[tuple[datetime.date, str], int] = {}
+    played: list[tuple[datetime.date, str]] = []
+    expected: dict[datetime.date, dict[str, str]] = {}
+    current: list[tuple] = [()]  # event being triggered, for the play callback
+    failures: list[str] = []
+
+    def dnd_day(day: datetime.date) -> bool:
+        return dnd_every > 0 and day.timetuple().tm_yday % dnd_every == 0
+
+    def is_dnd() -> bool:
+        return dnd_day(current[0][0])
+
+    def notify(prayer: str, city_name: str):
+        # The queue only ever holds events of the scheduler's current day
+        key = (controller.scheduler.date, prayer)
+        current[0] = key
+        fired[key] = fired.get(key, 0) + 1
+        scheduled = expected[key[0]][prayer]
+        if clock.now().strftime("%H:%M") != scheduled and not suspend_every:
+            failures.append(f"{city} {key[0]} {prayer} fired at "
+                            f"{clock.now():%H:%M:%S}, expected {scheduled}")
+
+    def play(prayer: str, city_name: str) -> bool:
+        played.append(current[0])
+        return True
+
+    def remind(event):
+        key = (controller.scheduler.date, event.name)
+        reminded[key] = reminded.get(key, 0) + 1
+        scheduled = expected[key[0]][event.name]
+        due = clock.now() + datetime.timedelta(minutes=event.lead)
+        if due.strftime("%H:%M") != scheduled and not suspend_every:
+            failures.append(f"{city} {key[0]} {event.name} reminder at "
+                            f"{clock.now():%H:%M:%S}, prayer at {scheduled}")
+
+    controller = AdhanController(
+        notify=notify,
+        play=play,
+        is_dnd=is_dnd,
+        clock=clock,
+        # Deadline-driven only: no periodic cap, so a year is ~2500 wake-ups
+        scheduler=PrayerScheduler(max_sleep_s=86400.0),
+        remind=remind,
+    )
+
+    def load(catch_up: bool) -> float:
+        day = clock.now().date()
+        expected[day] = service.compute_local(city, day)
+        reminders = dict.fromkeys(expected[day], reminder)
+        return controller.load(expected[day], catch_up, reminders=reminders)
+
+    def next_suspend(after: datetime.datetime) -> datetime.datetime | None:
+        if not suspend_every:
+            return None
+        return after + datetime.timedelta(
+            days=suspend_every, seconds=rng.uniform(0, 86400)
+        )
+
+    suspend_at = next_suspend(start)
+    delay = load(catch_up=False)
+    while clock.now() < end:
+        wake_at = clock.now() + datetime.timedelta(seconds=delay)
+        if suspend_at is not None and suspend_at < wake_at:
+            # The machine sleeps: wall time moves, monotonic time does not
+            clock.advance((suspend_at - clock.now()).total_seconds())
+            clock.jump(suspend_hours * 3600)
+            suspend_at = next_suspend(clock.now())
+        else:
+            clock.advance(delay)
+
+        day = controller.scheduler.date
+        result, delay = controller.wake()
+        for event in result.missed:
+            if event.kind == ADHAN:
+                missed[(day, event.name)] = missed.get((day, event.name), 0) + 1
+        if result.day_changed:
+            delay = load(catch_up=True)
+
+    # --- Assertions ---
+    for day, times in expected.items():
+        if day.year != year:
+            continue
+        for prayer in times:
+            key = (day, prayer)
+            count = fired.get(key, 0) + missed.get(key, 0)
+            if count != 1:
+                failures.append(
+                    f"{city} {day} {prayer} fired {fired.get(key, 0)}x, "
+                    f"missed {missed.get(key, 0)}x"
+                )
+            elif missed.get(key) and not suspend_every:
+                failures.append(f"{city} {day} {prayer} missed without a suspend")
+            if reminder and not suspend_every and reminded.get(key, 0) != 1:
+                failures.append(f"{city} {day} {prayer} reminded {reminded.get(key, 0)}x")
+
+    days = (end - start).days
+    if not suspend_every and len(expected) != days + 1:
+        failures.append(f"{city}: loaded {len(expected)} schedules for {days} days")
+
+    for day, prayer in played:
+        if dnd_day(day):
+            failures.append(f"{city} {day} {prayer} played during DND")
+    expected_plays = sum(
+        count for (day, _), count in fired.items() if not dnd_day(day)
+    )
+    if len(played) != expected_plays:
+        failures.append(f"{city}: {len(played)} plays, expected {expected_plays}")
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--year", type=int, default=datetime.date.today().year)
+    parser.add_argument("--city", action="append", help="limit to these cities")
+    parser.add_argument("--dnd-every", type=int, default=7,
+                        help="Do Not Disturb is on every Nth day of the year")
+    parser.add_argument("--suspend-every", type=int, default=0,
+                        help="suspend the machine roughly every N days")
+    parser.add_argument("--suspend-hours", type=float, default=6.0)
+    parser.add_argument("--reminder", type=int, default=10,
+                        help="minutes of reminder before each prayer (0 = none)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="cities simulated in parallel")
+    args = parser.parse_args()
+
+    cities = args.city or CITIES
+    started = time.perf_counter()
+    failures: list[str] = []
+
+    run = partial(
+        simulate_city,
+        year=args.year,
+        dnd_every=args.dnd_every,
+        suspend_every=args.suspend_every,
+        suspend_hours=args.suspend_hours,
+        reminder=args.reminder,
+    )
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for city_failures in pool.map(run, cities, chunksize=8):
+            failures += city_failures
+
+    elapsed = time.perf_counter() - started
+    print(f"Simulated {len(cities)} kota x {args.year} dalam {elapsed:.2f} s")
+    if failures:
+        for line in failures[:50]:
+            print(f"❌ {line}")
+        print(f"❌ {len(failures)} kegagalan")
+        sys.exit(1)
+    print("✅ Semua adzan terpicu tepat satu kali")
+
+
+if __name__ == "__main__":
+    main()